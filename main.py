@@ -1,5 +1,153 @@
-from virtual_world.simulation import Simulation
+import argparse
+
+from virtual_world.config import Config
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Virtual world simulation")
+    parser.add_argument(
+        "--serve", action="store_true", help="run a headless simulation server"
+    )
+    parser.add_argument(
+        "--connect", action="store_true", help="watch a running simulation server"
+    )
+    parser.add_argument("--host", default=Config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=Config.SERVER_PORT)
+    parser.add_argument("--width", type=int, default=Config.WORLD_WIDTH)
+    parser.add_argument("--height", type=int, default=Config.WORLD_HEIGHT)
+    parser.add_argument("--load", help="world save to serve")
+    parser.add_argument("--seed", type=int, help="seed of the world's random numbers")
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="time the benchmark scenarios and compare them with the baseline",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=Config.BENCHMARK_BASELINE_FILE_NAME,
+        help="benchmark baseline file",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="store the benchmark results as the new baseline",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=Config.BENCHMARK_THRESHOLD,
+        help="slowdown that counts as a regression, e.g. 0.1 for 10%%",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=Config.BENCHMARK_REPEATS,
+        help="benchmark runs per scenario",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="print the memory used by the organisms of a world and exit",
+    )
+    parser.add_argument(
+        "--trace", help="file to write a Chrome trace of the simulation to"
+    )
+    parser.add_argument(
+        "--interval", type=float, help="seconds between turns in server mode"
+    )
+    parser.add_argument("--frames", help="directory to write rendered frames to")
+    parser.add_argument(
+        "--encoder",
+        help="command that reads PPM frames from stdin, "
+        "e.g. 'ffmpeg -f image2pipe -c:v ppm -i - run.mp4'",
+    )
+    parser.add_argument("--frame-format", choices=["png", "ppm"], default="png")
+    parser.add_argument("--frame-width", type=int, default=Config.FRAME_WIDTH)
+    parser.add_argument("--frame-height", type=int, default=Config.FRAME_HEIGHT)
+    parser.add_argument(
+        "--every", type=int, default=Config.FRAME_EVERY, help="turns between frames"
+    )
+    parser.add_argument(
+        "--turns", type=int, default=100, help="turns to render without a display"
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    simulation = Simulation()
-    simulation.run()
+    arguments = parse_arguments()
+    if arguments.benchmark:
+        import sys
+
+        from virtual_world.benchmark import run_benchmarks
+
+        sys.exit(
+            run_benchmarks(
+                arguments.baseline,
+                arguments.threshold,
+                arguments.repeats,
+                arguments.update_baseline,
+            )
+        )
+    elif arguments.memory_report:
+        from virtual_world.memory import print_memory_report
+        from virtual_world.world import World
+
+        world = World(arguments.width, arguments.height, seed=arguments.seed)
+        if arguments.load:
+            world.load(arguments.load)
+        print_memory_report(world)
+    elif arguments.serve:
+        from virtual_world.server import SimulationServer
+        from virtual_world.tracing import Tracer
+        from virtual_world.world import World
+
+        world = World(arguments.width, arguments.height, seed=arguments.seed)
+        tracer = Tracer() if arguments.trace else None
+        world.set_tracer(tracer)
+        if arguments.load:
+            world.load(arguments.load)
+        try:
+            SimulationServer(
+                world, arguments.host, arguments.port, arguments.interval
+            ).run()
+        finally:
+            if tracer is not None:
+                tracer.save(arguments.trace)
+    elif arguments.frames or arguments.encoder:
+        import shlex
+
+        from virtual_world.organisms.direction import DirectionSquare, DirectionHexagon
+        from virtual_world.renderer.export import FrameExporter
+        from virtual_world.tracing import Tracer
+        from virtual_world.world import World
+
+        world = World(arguments.width, arguments.height, seed=arguments.seed)
+        tracer = Tracer() if arguments.trace else None
+        world.set_tracer(tracer)
+        if arguments.load:
+            world.load(arguments.load)
+        direction = (
+            DirectionSquare.NONE
+            if world.get_type() == World.WorldType.SQUARE
+            else DirectionHexagon.NONE
+        )
+        with FrameExporter(
+            arguments.frames,
+            shlex.split(arguments.encoder) if arguments.encoder else None,
+            arguments.frame_width,
+            arguments.frame_height,
+            arguments.every,
+            arguments.frame_format,
+        ) as exporter:
+            exporter.capture(world)
+            for _ in range(arguments.turns):
+                world.next_turn(direction)
+                exporter.capture(world)
+        if tracer is not None:
+            tracer.save(arguments.trace)
+    else:
+        from virtual_world.simulation import Simulation
+
+        server_address = (arguments.host, arguments.port) if arguments.connect else None
+        simulation = Simulation(server_address)
+        simulation.run()
@@ -0,0 +1,260 @@
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Optional, TypedDict
+
+from virtual_world.config import Config
+from virtual_world.organisms.direction import DirectionSquare, DirectionHexagon
+from virtual_world.world import World
+
+
+class Scenario(TypedDict):
+    name: str
+    type: World.WorldType
+    density: float
+    species: dict[str, int]
+
+
+class Measurement(TypedDict):
+    mean: float
+    interval: float
+
+
+PLANT_HEAVY_SPECIES: dict[str, int] = {
+    "Grass": 6,
+    "Dandelion": 3,
+    "Guarana": 2,
+    "Belladonna": 1,
+    "HeracleumSosnowskyi": 1,
+    "Sheep": 1,
+    "Turtle": 1,
+}
+PREDATOR_HEAVY_SPECIES: dict[str, int] = {
+    "Wolf": 4,
+    "Fox": 3,
+    "Antelope": 2,
+    "Sheep": 2,
+    "Turtle": 1,
+    "Grass": 1,
+}
+
+SCENARIOS: list[Scenario] = [
+    {
+        "name": f"{world_type.name.lower()}-{density_name}-{species_name}",
+        "type": world_type,
+        "density": density,
+        "species": species,
+    }
+    for world_type in (World.WorldType.SQUARE, World.WorldType.HEXAGONAL)
+    for density_name, density in (
+        ("sparse", Config.BENCHMARK_SPARSE_DENSITY),
+        ("dense", Config.BENCHMARK_DENSE_DENSITY),
+    )
+    for species_name, species in (
+        ("plants", PLANT_HEAVY_SPECIES),
+        ("predators", PREDATOR_HEAVY_SPECIES),
+    )
+]
+
+METRICS = ("next_turn", "save", "load", "peak_memory")
+
+# Two-sided 95% critical values of Student's t distribution by degrees of
+# freedom.
+T_CRITICAL_VALUES: list[tuple[int, float]] = [
+    (1, 12.706),
+    (2, 4.303),
+    (3, 3.182),
+    (4, 2.776),
+    (5, 2.571),
+    (6, 2.447),
+    (7, 2.365),
+    (8, 2.306),
+    (9, 2.262),
+    (10, 2.228),
+    (11, 2.201),
+    (12, 2.179),
+    (13, 2.160),
+    (14, 2.145),
+    (15, 2.131),
+    (16, 2.120),
+    (17, 2.110),
+    (18, 2.101),
+    (19, 2.093),
+    (20, 2.086),
+    (21, 2.080),
+    (22, 2.074),
+    (23, 2.069),
+    (24, 2.064),
+    (25, 2.060),
+    (26, 2.056),
+    (27, 2.052),
+    (28, 2.048),
+    (29, 2.045),
+    (30, 2.042),
+    (40, 2.021),
+    (60, 2.000),
+    (120, 1.980),
+]
+NORMAL_CRITICAL_VALUE = 1.960
+
+
+def get_t_critical_value(degrees_of_freedom: int) -> float:
+    if degrees_of_freedom < 1:
+        raise ValueError("A confidence interval needs at least two samples")
+    # The critical values are close to linear in 1 / degrees of freedom, so
+    # values between the table entries are interpolated on that scale, with
+    # the normal value as the limit.
+    previous_limit, previous_value = T_CRITICAL_VALUES[0]
+    for limit, value in T_CRITICAL_VALUES:
+        if degrees_of_freedom == limit:
+            return value
+        if degrees_of_freedom < limit:
+            fraction = (1 / previous_limit - 1 / degrees_of_freedom) / (
+                1 / previous_limit - 1 / limit
+            )
+            return previous_value + (value - previous_value) * fraction
+        previous_limit, previous_value = limit, value
+    return (
+        NORMAL_CRITICAL_VALUE
+        + (previous_value - NORMAL_CRITICAL_VALUE) * previous_limit / degrees_of_freedom
+    )
+
+
+def summarise(samples: list[float]) -> Measurement:
+    return {
+        "mean": statistics.mean(samples),
+        "interval": get_t_critical_value(len(samples) - 1)
+        * statistics.stdev(samples)
+        / len(samples) ** 0.5,
+    }
+
+
+def create_world(scenario: Scenario, seed: int) -> World:
+    size = Config.BENCHMARK_WORLD_SIZE
+    world = World(size, size, scenario["type"], seed=seed)
+    total = sum(scenario["species"].values())
+    world.populate(
+        {
+            species: scenario["density"] * weight / total
+            for species, weight in scenario["species"].items()
+        }
+    )
+    return world
+
+
+def run_scenario(scenario: Scenario, path: str, seed: int) -> dict[str, float]:
+    direction = (
+        DirectionSquare.NONE
+        if scenario["type"] == World.WorldType.SQUARE
+        else DirectionHexagon.NONE
+    )
+    world = create_world(scenario, seed)
+    start = time.perf_counter()
+    for _ in range(Config.BENCHMARK_TURNS):
+        world.next_turn(direction)
+    next_turn = (time.perf_counter() - start) / Config.BENCHMARK_TURNS
+
+    start = time.perf_counter()
+    world.save(path)
+    save = time.perf_counter() - start
+
+    loaded_world = World(world.get_width(), world.get_height())
+    start = time.perf_counter()
+    loaded_world.load(path)
+    load = time.perf_counter() - start
+    return {"next_turn": next_turn, "save": save, "load": load}
+
+
+def get_peak_memory(scenario: Scenario, seed: int) -> float:
+    # Tracing slows everything down, so memory is measured in a separate run
+    # from the timings.
+    tracemalloc.start()
+    try:
+        world = create_world(scenario, seed)
+        world.advance(Config.BENCHMARK_TURNS)
+        return float(tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+
+def measure(
+    scenario: Scenario, repeats: int = Config.BENCHMARK_REPEATS
+) -> dict[str, Measurement]:
+    samples: dict[str, list[float]] = {metric: [] for metric in METRICS}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "world.json")
+        for _ in range(repeats):
+            for metric, value in run_scenario(
+                scenario, path, Config.BENCHMARK_SEED
+            ).items():
+                samples[metric].append(value)
+            samples["peak_memory"].append(
+                get_peak_memory(scenario, Config.BENCHMARK_SEED)
+            )
+    return {metric: summarise(values) for metric, values in samples.items()}
+
+
+def is_regression(
+    baseline: Measurement, current: Measurement, threshold: float
+) -> bool:
+    # Only a slowdown that the confidence interval cannot explain counts.
+    return current["mean"] - current["interval"] > (
+        baseline["mean"] + baseline["interval"]
+    ) * (1 + threshold)
+
+
+def format_value(metric: str, value: float) -> str:
+    if metric == "peak_memory":
+        return f"{value / 1024 / 1024:.2f} MiB"
+    return f"{value * 1000:.2f} ms"
+
+
+def run_benchmarks(
+    baseline_path: str = Config.BENCHMARK_BASELINE_FILE_NAME,
+    threshold: float = Config.BENCHMARK_THRESHOLD,
+    repeats: int = Config.BENCHMARK_REPEATS,
+    update: bool = False,
+) -> int:
+    if repeats < Config.BENCHMARK_MIN_REPEATS:
+        print(f"At least {Config.BENCHMARK_MIN_REPEATS} repeats are needed")
+        return 2
+    baseline: Optional[dict[str, dict[str, Measurement]]] = None
+    if os.path.exists(baseline_path):
+        with open(baseline_path, "r") as file:
+            baseline = json.load(file)
+    elif not update:
+        print(f"No baseline at {baseline_path}, run with --update-baseline first")
+        return 2
+
+    results = {}
+    regressions = 0
+    for scenario in SCENARIOS:
+        results[scenario["name"]] = measure(scenario, repeats)
+        for metric in METRICS:
+            current = results[scenario["name"]][metric]
+            line = (
+                f"{scenario['name']:<28}{metric:<12}"
+                f"{format_value(metric, current['mean']):>14} "
+                f"± {format_value(metric, current['interval']):<12}"
+            )
+            if baseline is not None and metric in baseline.get(scenario["name"], {}):
+                expected = baseline[scenario["name"]][metric]
+                change = current["mean"] / expected["mean"] - 1
+                line += f"{change:>+9.1%}"
+                if is_regression(expected, current, threshold):
+                    line += "  REGRESSION"
+                    regressions += 1
+            print(line)
+
+    if update:
+        with open(baseline_path, "w") as file:
+            json.dump(results, file, indent=4)
+        print(f"Baseline written to {baseline_path}")
+        return 0
+    if regressions:
+        print(f"{regressions} metrics regressed by more than {threshold:.0%}")
+        return 1
+    return 0
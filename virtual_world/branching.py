@@ -0,0 +1,36 @@
+import multiprocessing
+from typing import Callable, Optional, TypeVar
+
+from virtual_world.world import World
+
+T = TypeVar("T")
+
+_branch_world: Optional[World] = None
+_branch_functions: list[Callable[[World], object]] = []
+
+
+def _run_branch(index: int) -> object:
+    assert _branch_world is not None
+    return _branch_functions[index](_branch_world.fork())
+
+
+def run_branches(
+    world: World,
+    branches: list[Callable[[World], T]],
+    processes: Optional[int] = None,
+) -> list[T]:
+    global _branch_world, _branch_functions
+
+    if processes == 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return [branch(world.fork()) for branch in branches]
+
+    # Worker processes inherit the world through fork(), so its pages are
+    # shared copy-on-write and only the branch results are pickled back.
+    _branch_world = world
+    _branch_functions = branches  # type: ignore # assignment
+    try:
+        with multiprocessing.get_context("fork").Pool(processes) as pool:
+            return pool.map(_run_branch, range(len(branches)))  # type: ignore # return-value
+    finally:
+        _branch_world = None
+        _branch_functions = []
@@ -0,0 +1,98 @@
+import json
+from typing import Any, Optional
+
+from virtual_world.logs import LogEventType
+from virtual_world.organisms.factory import OrganismFactory
+from virtual_world.organisms.position import PositionSquare, PositionHexagon
+from virtual_world.world import World
+
+
+class WorldMirror:
+    import virtual_world.organisms.organism as organism
+
+    __world: World
+    __entities: dict[int, "organism.Organism"]
+    __buffer: bytes
+
+    def __init__(self) -> None:
+        self.__world = World()
+        self.__entities = {}
+        self.__buffer = b""
+
+    def get_world(self) -> World:
+        return self.__world
+
+    def feed(self, data: bytes) -> list[str]:
+        self.__buffer += data
+        *lines, self.__buffer = self.__buffer.split(b"\n")
+        return [self.apply(json.loads(line)) for line in lines if line]
+
+    def apply(self, message: dict[str, Any]) -> str:
+        if message["type"] == "snapshot":
+            self.apply_snapshot(message["world"])
+        elif message["type"] == "diff":
+            self.apply_diff(message["diff"])
+        elif message["type"] == "error":
+            self.__world.add_log(message["message"])
+        else:
+            raise ValueError(f"Unknown message type: {message['type']}")
+        return str(message["type"])
+
+    def apply_snapshot(self, data: dict[str, Any]) -> None:
+        self.__world.set_from_dict({**data, "entities": []})
+        self.__entities = {}
+        player = self.__world.get_player()
+        if player is not None and data["player"] is not None:
+            self.__entities[data["player"]["id"]] = player
+        for entity_data in data["entities"]:
+            entity = OrganismFactory.create(entity_data)
+            self.__world.add_entity(entity)
+            self.__entities[entity_data["id"]] = entity
+
+    def apply_diff(self, data: dict[str, Any]) -> None:
+        for died in data["died"]:
+            entity = self.__entities.pop(died["id"], None)
+            if entity is not None:
+                self.__world.remove_entity(entity)
+        # The mirror never runs a turn, so it clears its own dead list.
+        self.__world.remove_dead_entities()
+        if data["turn"] > self.__world.get_turn():
+            self.__world.increase_aging_turn()
+        for moved in data["moved"]:
+            entity = self.__entities.get(moved["id"])
+            if entity is not None:
+                self.__world.move_organism(
+                    entity, self.__get_position(moved["new_position"]), force=True
+                )
+        for strengthened in data["strengthened"]:
+            entity = self.__entities.get(strengthened["id"])
+            if entity is not None:
+                entity.increase_strength(
+                    strengthened["strength"] - entity.get_strength()
+                )
+        for born in data["born"]:
+            entity = OrganismFactory.create(born["organism"])
+            self.__world.add_entity(entity)
+            self.__entities[born["id"]] = entity
+        player = self.__world.get_player()
+        if player is not None and data["player_ability"] is not None:
+            ability = data["player_ability"]
+            player.set_special_ability_cooldown(ability["special_ability_cooldown"])
+            player.set_special_ability_duration(ability["special_ability_duration"])
+            player.set_special_ability_active(ability["special_ability_active"])
+        for log in data["logs"]:
+            self.__world.add_log(log["message"], event_type=LogEventType[log["type"]])
+        self.__world.set_turn(data["turn"])
+
+    @staticmethod
+    def __get_position(data: dict[str, int]) -> PositionSquare | PositionHexagon:
+        if len(data) == 2:
+            return PositionSquare(**data)
+        return PositionHexagon(**data)
+
+    @staticmethod
+    def encode_command(command: str, direction: Optional[str] = None) -> bytes:
+        message: dict[str, Any] = {"command": command}
+        if direction is not None:
+            message["direction"] = direction
+        return json.dumps(message).encode() + b"\n"
@@ -54,6 +54,40 @@ class Config:
     SAVE_FILE_NAME: str = "save.json"
     LOAD_FILE_NAME: str = SAVE_FILE_NAME
 
+    CHUNK_SIZE: int = 32
+    SPECIES_TILE_SIZE: int = 4
+    HEX_GRID_MAX_CELLS: int = 1_000_000
+    SHARD_COUNT: int = 4
+    SHARD_HALO_ROWS: int = 3
+
+    LOG_CAPACITY: int = 1000
+
     BASE_FIELD_SIZE: int = 20
     WORLD_WINDOW_WIDTH: int = 1000
     WORLD_WINDOW_HEIGHT: int = 1000
+    AUTO_PLAY_INTERVAL: int = 100
+    MIN_ZOOM_CELL_SIZE: float = 1 / 1024
+    MAX_ZOOM_CELL_SIZE: float = 64.0
+    ZOOM_STEP: float = 1.25
+    GRID_MIN_CELL_SIZE: float = 4.0
+    DENSITY_COLOR: Tuple[int, int, int] = (0, 96, 0)
+
+    FRAME_WIDTH: int = 800
+    FRAME_HEIGHT: int = 800
+    FRAME_EVERY: int = 1
+    FRAME_QUEUE_SIZE: int = 8
+    FRAME_BACKGROUND_COLOR: Tuple[int, int, int] = (239, 239, 239)
+
+    BENCHMARK_BASELINE_FILE_NAME: str = "benchmark_baseline.json"
+    BENCHMARK_WORLD_SIZE: int = 48
+    BENCHMARK_SPARSE_DENSITY: float = 0.05
+    BENCHMARK_DENSE_DENSITY: float = 0.5
+    BENCHMARK_TURNS: int = 5
+    BENCHMARK_REPEATS: int = 5
+    BENCHMARK_MIN_REPEATS: int = 5
+    BENCHMARK_SEED: int = 0
+    BENCHMARK_THRESHOLD: float = 0.1
+
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8765
+    SERVER_QUEUE_SIZE: int = 256
@@ -0,0 +1,186 @@
+from typing import Any, Optional, TypedDict
+
+from virtual_world.organisms.position import PositionSquare, PositionHexagon
+
+
+class TurnDiff:
+    import virtual_world.organisms.organism as organism
+
+    class BornRepresentation(TypedDict):
+        id: int
+        organism: dict[str, Any]
+
+    class MovedRepresentation(TypedDict):
+        id: int
+        old_position: (
+            PositionSquare.PositionRepresentation
+            | PositionHexagon.PositionRepresentation
+        )
+        new_position: (
+            PositionSquare.PositionRepresentation
+            | PositionHexagon.PositionRepresentation
+        )
+
+    class DiedRepresentation(TypedDict):
+        id: int
+        position: (
+            PositionSquare.PositionRepresentation
+            | PositionHexagon.PositionRepresentation
+        )
+
+    class StrengthenedRepresentation(TypedDict):
+        id: int
+        strength: int
+
+    class AbilityRepresentation(TypedDict):
+        special_ability_cooldown: int
+        special_ability_duration: int
+        special_ability_active: bool
+
+    class TurnDiffRepresentation(TypedDict):
+        turn: int
+        reset: bool
+        born: list["TurnDiff.BornRepresentation"]
+        moved: list["TurnDiff.MovedRepresentation"]
+        died: list["TurnDiff.DiedRepresentation"]
+        strengthened: list["TurnDiff.StrengthenedRepresentation"]
+        player_ability: Optional["TurnDiff.AbilityRepresentation"]
+
+    __turn: int
+    __reset: bool
+    __born: dict[int, "organism.Organism"]
+    __born_organisms: dict[int, dict[str, Any]]
+    __moved: dict[
+        int, tuple[PositionSquare | PositionHexagon, PositionSquare | PositionHexagon]
+    ]
+    __died: dict[int, PositionSquare | PositionHexagon]
+    __strengthened: dict[int, int]
+    __initial_player_ability: Optional[AbilityRepresentation]
+    __player_ability: Optional[AbilityRepresentation]
+
+    def __init__(
+        self, turn: int, player_ability: Optional[AbilityRepresentation] = None
+    ) -> None:
+        self.__turn = turn
+        self.__reset = False
+        self.__born = {}
+        self.__born_organisms = {}
+        self.__moved = {}
+        self.__died = {}
+        self.__strengthened = {}
+        self.__initial_player_ability = player_ability
+        self.__player_ability = None
+
+    def add_born(self, entity_id: int, entity: "organism.Organism") -> None:
+        self.__born[entity_id] = entity
+
+    def add_moved(
+        self,
+        entity_id: int,
+        old_position: PositionSquare | PositionHexagon,
+        new_position: PositionSquare | PositionHexagon,
+    ) -> None:
+        # Several changes to one organism collapse into a single entry, so the
+        # diff stays as small as the set of organisms that changed. Organisms
+        # born in this diff are sent with their state when it is closed.
+        if entity_id in self.__born:
+            return
+        if entity_id in self.__moved:
+            old_position = self.__moved[entity_id][0]
+        if old_position == new_position:
+            self.__moved.pop(entity_id, None)
+        else:
+            self.__moved[entity_id] = (old_position, new_position)
+
+    def add_strengthened(self, entity_id: int, strength: int) -> None:
+        if entity_id not in self.__born:
+            self.__strengthened[entity_id] = strength
+
+    def add_died(
+        self, entity_id: int, position: PositionSquare | PositionHexagon
+    ) -> None:
+        if self.__born.pop(entity_id, None) is not None:
+            return
+        self.__strengthened.pop(entity_id, None)
+        # An organism that moved before dying is reported where it was last
+        # seen, since its move is dropped.
+        moved = self.__moved.pop(entity_id, None)
+        if moved is not None:
+            position = moved[0]
+        self.__died[entity_id] = position
+
+    def close(self, turn: int, player_ability: Optional[AbilityRepresentation]) -> None:
+        self.__turn = turn
+        self.__born_organisms = {
+            entity_id: dict(entity.__dict__())
+            for entity_id, entity in self.__born.items()
+        }
+        self.__born = {}
+        if player_ability != self.__initial_player_ability:
+            self.__player_ability = player_ability
+
+    def get_turn(self) -> int:
+        return self.__turn
+
+    def is_reset(self) -> bool:
+        return self.__reset
+
+    def set_reset(self, reset: bool) -> None:
+        self.__reset = reset
+
+    def get_born(self) -> dict[int, dict[str, Any]]:
+        return self.__born_organisms
+
+    def get_moved(
+        self,
+    ) -> dict[
+        int, tuple[PositionSquare | PositionHexagon, PositionSquare | PositionHexagon]
+    ]:
+        return self.__moved
+
+    def get_died(self) -> dict[int, PositionSquare | PositionHexagon]:
+        return self.__died
+
+    def get_strengthened(self) -> dict[int, int]:
+        return self.__strengthened
+
+    def get_player_ability(self) -> Optional[AbilityRepresentation]:
+        return self.__player_ability
+
+    def is_empty(self) -> bool:
+        return not (
+            self.__reset
+            or self.__born
+            or self.__born_organisms
+            or self.__moved
+            or self.__died
+            or self.__strengthened
+            or self.__player_ability
+        )
+
+    def __dict__(self) -> TurnDiffRepresentation:  # type: ignore # override
+        return {
+            "turn": self.__turn,
+            "reset": self.__reset,
+            "born": [
+                {"id": entity_id, "organism": organism}
+                for entity_id, organism in self.__born_organisms.items()
+            ],
+            "moved": [
+                {
+                    "id": entity_id,
+                    "old_position": old_position.__dict__(),
+                    "new_position": new_position.__dict__(),
+                }
+                for entity_id, (old_position, new_position) in self.__moved.items()
+            ],
+            "died": [
+                {"id": entity_id, "position": position.__dict__()}
+                for entity_id, position in self.__died.items()
+            ],
+            "strengthened": [
+                {"id": entity_id, "strength": strength}
+                for entity_id, strength in self.__strengthened.items()
+            ],
+            "player_ability": self.__player_ability,
+        }
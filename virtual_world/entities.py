@@ -0,0 +1,120 @@
+from typing import Iterator, Optional
+
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+def get_slot(entity_id: int) -> int:
+    return entity_id & SLOT_MASK
+
+
+def get_generation(entity_id: int) -> int:
+    return entity_id >> SLOT_BITS
+
+
+class EntityStore:
+    import virtual_world.organisms.organism as organism
+
+    __entities: list["organism.Organism"]
+    __entity_slots: list[int]
+    __indices: list[int]
+    __generations: list[int]
+    __free_slots: list[int]
+    __next_sequence: int
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def add(self, entity: "organism.Organism") -> int:
+        if self.__free_slots:
+            slot = self.__free_slots.pop()
+        else:
+            slot = len(self.__generations)
+            self.__generations.append(0)
+            self.__indices.append(-1)
+        self.__indices[slot] = len(self.__entities)
+        self.__entities.append(entity)
+        self.__entity_slots.append(slot)
+        entity_id = self.__generations[slot] << SLOT_BITS | slot
+        entity.set_id(entity_id)
+        entity.set_sequence(self.__next_sequence)
+        self.__next_sequence += 1
+        return entity_id
+
+    def remove(self, entity: "organism.Organism") -> None:
+        if not self.contains(entity):
+            raise ValueError(f"{entity} is not in the entity store")
+        slot = get_slot(entity.get_id())  # type: ignore # arg-type
+        index = self.__indices[slot]
+        # The last entity takes the place of the removed one, so removal does
+        # not shift the rest of the list.
+        last_entity = self.__entities.pop()
+        last_slot = self.__entity_slots.pop()
+        if last_entity is not entity:
+            self.__entities[index] = last_entity
+            self.__entity_slots[index] = last_slot
+            self.__indices[last_slot] = index
+        self.__indices[slot] = -1
+        self.__generations[slot] += 1
+        self.__free_slots.append(slot)
+
+    def get(self, entity_id: int) -> Optional["organism.Organism"]:
+        slot = get_slot(entity_id)
+        if slot >= len(self.__generations):
+            return None
+        if self.__generations[slot] != get_generation(entity_id):
+            return None
+        index = self.__indices[slot]
+        if index < 0:
+            return None
+        return self.__entities[index]
+
+    def contains(self, entity: "organism.Organism") -> bool:
+        entity_id = entity.get_id()
+        return entity_id is not None and self.get(entity_id) is entity
+
+    def clear(self) -> None:
+        self.__entities = []
+        self.__entity_slots = []
+        self.__indices = []
+        self.__generations = []
+        self.__free_slots = []
+        self.__next_sequence = 0
+
+    def replace(
+        self, entity: "organism.Organism", replacement: "organism.Organism"
+    ) -> None:
+        if not self.contains(entity):
+            raise ValueError(f"{entity} is not in the entity store")
+        # The replacement takes over the id, the sequence number and the place
+        # of the entity.
+        index = self.__indices[get_slot(entity.get_id())]  # type: ignore # arg-type
+        replacement.set_id(entity.get_id())
+        replacement.set_sequence(entity.get_sequence())
+        self.__entities[index] = replacement
+
+    def copy(self) -> "EntityStore":
+        # The copy holds the same entities, only the bookkeeping is copied.
+        entity_store = EntityStore()
+        entity_store.__entities = self.__entities.copy()
+        entity_store.__entity_slots = self.__entity_slots.copy()
+        entity_store.__indices = self.__indices.copy()
+        entity_store.__generations = self.__generations.copy()
+        entity_store.__free_slots = self.__free_slots.copy()
+        entity_store.__next_sequence = self.__next_sequence
+        return entity_store
+
+    def get_entities(self) -> list["organism.Organism"]:
+        return self.__entities
+
+    def get_entities_in_order(self) -> list["organism.Organism"]:
+        return sorted(self.__entities, key=lambda entity: entity.get_sequence())
+
+    def get_capacity(self) -> int:
+        return len(self.__generations)
+
+    def __iter__(self) -> Iterator["organism.Organism"]:
+        return iter(self.__entities)
+
+    def __len__(self) -> int:
+        return len(self.__entities)
@@ -0,0 +1,419 @@
+from math import ceil
+from typing import Iterator, Optional
+
+from virtual_world.config import Config
+from virtual_world.organisms.position import PositionSquare, PositionHexagon
+
+
+class ChunkedGrid:
+    import virtual_world.organisms.organism as organism
+
+    __chunk_size: int
+    __chunks: dict[
+        tuple[int, int], dict[PositionSquare | PositionHexagon, "organism.Organism"]
+    ]
+    __buried: dict[PositionSquare | PositionHexagon, "organism.Organism"]
+    __shared: set[tuple[int, int]]
+    __tile_size: int
+    __tile_species: dict[
+        tuple[int, int], dict[tuple[int, int], dict[type["organism.Organism"], int]]
+    ]
+
+    def __init__(
+        self,
+        chunk_size: int = Config.CHUNK_SIZE,
+        tile_size: int = Config.SPECIES_TILE_SIZE,
+    ) -> None:
+        self.__chunk_size = chunk_size
+        self.__tile_size = tile_size
+        self.__chunks = {}
+        self.__buried = {}
+        self.__shared = set()
+        self.__tile_species = {}
+
+    def get_chunk_key(
+        self, position: PositionSquare | PositionHexagon
+    ) -> tuple[int, int]:
+        return (
+            position[0] // self.__chunk_size,
+            position[1] // self.__chunk_size,
+        )
+
+    def get(
+        self, position: PositionSquare | PositionHexagon
+    ) -> Optional["organism.Organism"]:
+        chunk = self.__chunks.get(self.get_chunk_key(position))
+        if chunk is None:
+            return None
+        return chunk.get(position)
+
+    def __get_own_chunk(
+        self, chunk_key: tuple[int, int]
+    ) -> Optional[dict[PositionSquare | PositionHexagon, "organism.Organism"]]:
+        chunk = self.__chunks.get(chunk_key)
+        # A chunk shared with a fork is copied before its first change.
+        if chunk is not None and self.__shared and chunk_key in self.__shared:
+            chunk = self.__chunks[chunk_key] = chunk.copy()
+            self.__tile_species[chunk_key] = {
+                tile_key: counts.copy()
+                for tile_key, counts in self.__tile_species[chunk_key].items()
+            }
+            self.__shared.discard(chunk_key)
+        return chunk
+
+    def __count_tile_species(
+        self,
+        chunk_key: tuple[int, int],
+        position: PositionSquare | PositionHexagon,
+        entity: "organism.Organism",
+        change: int,
+    ) -> None:
+        tiles = self.__tile_species.get(chunk_key)
+        if tiles is None:
+            tiles = self.__tile_species[chunk_key] = {}
+        tile_key = (position[0] // self.__tile_size, position[1] // self.__tile_size)
+        counts = tiles.get(tile_key)
+        if counts is None:
+            counts = tiles[tile_key] = {}
+        species = type(entity)
+        count = counts.get(species, 0) + change
+        if count:
+            counts[species] = count
+            return
+        del counts[species]
+        if not counts:
+            del tiles[tile_key]
+            if not tiles:
+                del self.__tile_species[chunk_key]
+
+    def set(
+        self, position: PositionSquare | PositionHexagon, entity: "organism.Organism"
+    ) -> None:
+        chunk_key = self.get_chunk_key(position)
+        chunk = self.__get_own_chunk(chunk_key)
+        if chunk is None:
+            chunk = self.__chunks[chunk_key] = {}
+        occupant = chunk.get(position)
+        if occupant is not entity:
+            if occupant is not None:
+                self.__count_tile_species(chunk_key, position, occupant, -1)
+            self.__count_tile_species(chunk_key, position, entity, 1)
+        # Dead organisms keep their cell until the end of the turn, so one
+        # that is walked over has to come back once the cell is left.
+        if occupant is not None and occupant is not entity and not occupant.is_alive():
+            self.__buried[position] = occupant
+        chunk[position] = entity
+
+    def remove(
+        self, position: PositionSquare | PositionHexagon, entity: "organism.Organism"
+    ) -> None:
+        chunk_key = self.get_chunk_key(position)
+        chunk = self.__get_own_chunk(chunk_key)
+        if self.__buried.get(position) is entity:
+            del self.__buried[position]
+            return
+        if chunk is None or chunk.get(position) is not entity:
+            return
+        self.__count_tile_species(chunk_key, position, entity, -1)
+        if position in self.__buried:
+            chunk[position] = self.__buried.pop(position)
+            self.__count_tile_species(chunk_key, position, chunk[position], 1)
+            return
+        del chunk[position]
+        if not chunk:
+            del self.__chunks[chunk_key]
+
+    def replace(
+        self,
+        position: PositionSquare | PositionHexagon,
+        entity: "organism.Organism",
+        replacement: "organism.Organism",
+    ) -> None:
+        if self.__buried.get(position) is entity:
+            self.__buried[position] = replacement
+            return
+        chunk_key = self.get_chunk_key(position)
+        chunk = self.__get_own_chunk(chunk_key)
+        if chunk is not None and chunk.get(position) is entity:
+            chunk[position] = replacement
+            self.__count_tile_species(chunk_key, position, entity, -1)
+            self.__count_tile_species(chunk_key, position, replacement, 1)
+
+    def clear(self) -> None:
+        self.__chunks = {}
+        self.__buried = {}
+        self.__shared = set()
+        self.__tile_species = {}
+
+    def fork(self) -> "ChunkedGrid":
+        # Both grids keep the chunks they had and copy one only when it is
+        # changed, so a fork costs one entry per chunk.
+        grid = ChunkedGrid(self.__chunk_size, self.__tile_size)
+        grid.__chunks = self.__chunks.copy()
+        grid.__buried = self.__buried.copy()
+        grid.__tile_species = self.__tile_species.copy()
+        grid.__shared = set(self.__chunks)
+        self.__shared = set(self.__chunks)
+        return grid
+
+    def get_chunk_size(self) -> int:
+        return self.__chunk_size
+
+    def get_chunk_keys(self) -> list[tuple[int, int]]:
+        return list(self.__chunks)
+
+    def get_chunk_populations(self) -> dict[tuple[int, int], int]:
+        return {chunk_key: len(chunk) for chunk_key, chunk in self.__chunks.items()}
+
+    def __get_chunk_keys_in_area(
+        self, first: tuple[int, int], last: tuple[int, int]
+    ) -> list[tuple[int, int]]:
+        first_chunk = (first[0] // self.__chunk_size, first[1] // self.__chunk_size)
+        last_chunk = (last[0] // self.__chunk_size, last[1] // self.__chunk_size)
+        if (last_chunk[0] - first_chunk[0] + 1) * (
+            last_chunk[1] - first_chunk[1] + 1
+        ) > len(self.__chunks):
+            return [
+                chunk_key
+                for chunk_key in self.__chunks
+                if first_chunk[0] <= chunk_key[0] <= last_chunk[0]
+                and first_chunk[1] <= chunk_key[1] <= last_chunk[1]
+            ]
+        return [
+            (chunk_x, chunk_y)
+            for chunk_x in range(first_chunk[0], last_chunk[0] + 1)
+            for chunk_y in range(first_chunk[1], last_chunk[1] + 1)
+            if (chunk_x, chunk_y) in self.__chunks
+        ]
+
+    def get_tile_size(self) -> int:
+        return self.__tile_size
+
+    def get_species_tiles(
+        self, first: tuple[int, int], last: tuple[int, int]
+    ) -> Iterator[tuple[tuple[int, int], dict[type["organism.Organism"], int]]]:
+        first_tile = (first[0] // self.__tile_size, first[1] // self.__tile_size)
+        last_tile = (last[0] // self.__tile_size, last[1] // self.__tile_size)
+        for chunk_key in self.__get_chunk_keys_in_area(first, last):
+            for tile_key, counts in self.__tile_species[chunk_key].items():
+                if first_tile[0] <= tile_key[0] <= last_tile[0] and (
+                    first_tile[1] <= tile_key[1] <= last_tile[1]
+                ):
+                    yield tile_key, counts
+
+    def get_tile_species(
+        self, tile_key: tuple[int, int]
+    ) -> dict[type["organism.Organism"], int]:
+        tiles = self.__tile_species.get(
+            (
+                tile_key[0] * self.__tile_size // self.__chunk_size,
+                tile_key[1] * self.__tile_size // self.__chunk_size,
+            )
+        )
+        if tiles is None:
+            return {}
+        return tiles.get(tile_key, {})
+
+    def get_entities_in_area(
+        self, first: tuple[int, int], last: tuple[int, int]
+    ) -> Iterator["organism.Organism"]:
+        for chunk_key in self.__get_chunk_keys_in_area(first, last):
+            for position, entity in self.__chunks[chunk_key].items():
+                if first[0] <= position[0] <= last[0] and (
+                    first[1] <= position[1] <= last[1]
+                ):
+                    yield entity
+
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self.__chunks.values())
+
+
+class HexagonalGrid:
+    import virtual_world.organisms.organism as organism
+
+    __chunk_size: int
+    __half_width: int
+    __half_height: int
+    __columns: int
+    __valid: bytearray
+    __rows: list[list[Optional["organism.Organism"]]]
+    __chunk_populations: dict[tuple[int, int], int]
+    __buried: dict[int, "organism.Organism"]
+    __shared: set[int]
+    __size: int
+
+    def __init__(
+        self, width: int, height: int, chunk_size: int = Config.CHUNK_SIZE
+    ) -> None:
+        self.__chunk_size = chunk_size
+        self.__half_width = ceil(width / 2)
+        self.__half_height = ceil(height / 2)
+        self.__columns = 2 * self.__half_width
+        self.__valid = bytearray(self.__columns * 2 * self.__half_height)
+        for r in range(-self.__half_height, self.__half_height):
+            first_q = max(-self.__half_width, 1 - self.__half_width - r)
+            last_q = min(self.__half_width - 1, self.__half_width - r)
+            if first_q <= last_q:
+                self.__valid[
+                    self.__get_index(first_q, r) : self.__get_index(last_q, r) + 1
+                ] = b"\x01" * (last_q - first_q + 1)
+        self.clear()
+
+    def __get_index(self, q: int, r: int) -> int:
+        return (r + self.__half_height) * self.__columns + q + self.__half_width
+
+    def __get_valid_index(self, q: int, r: int) -> Optional[int]:
+        if not (
+            -self.__half_width <= q < self.__half_width
+            and -self.__half_height <= r < self.__half_height
+        ):
+            return None
+        index = self.__get_index(q, r)
+        if not self.__valid[index]:
+            return None
+        return index
+
+    def is_valid(self, q: int, r: int) -> bool:
+        return self.__get_valid_index(q, r) is not None
+
+    def get_chunk_key(
+        self, position: PositionSquare | PositionHexagon
+    ) -> tuple[int, int]:
+        return (
+            position[0] // self.__chunk_size,
+            position[1] // self.__chunk_size,
+        )
+
+    def get(
+        self, position: PositionSquare | PositionHexagon
+    ) -> Optional["organism.Organism"]:
+        index = self.__get_valid_index(position[0], position[1])
+        if index is None:
+            return None
+        row, column = divmod(index, self.__columns)
+        return self.__rows[row][column]
+
+    def __get_own_row(
+        self, index: int
+    ) -> tuple[list[Optional["organism.Organism"]], int]:
+        row_index, column = divmod(index, self.__columns)
+        row = self.__rows[row_index]
+        # A row shared with a fork is copied before its first change.
+        if self.__shared and row_index in self.__shared:
+            row = self.__rows[row_index] = row.copy()
+            self.__shared.discard(row_index)
+        return row, column
+
+    def set(
+        self, position: PositionSquare | PositionHexagon, entity: "organism.Organism"
+    ) -> None:
+        index = self.__get_valid_index(position[0], position[1])
+        if index is None:
+            raise ValueError(f"{position} is outside of the hexagonal grid")
+        row, column = self.__get_own_row(index)
+        occupant = row[column]
+        if occupant is None:
+            self.__change_population(position, 1)
+        elif occupant is not entity and not occupant.is_alive():
+            self.__buried[index] = occupant
+        row[column] = entity
+
+    def remove(
+        self, position: PositionSquare | PositionHexagon, entity: "organism.Organism"
+    ) -> None:
+        index = self.__get_valid_index(position[0], position[1])
+        if index is None:
+            return
+        if self.__buried.get(index) is entity:
+            del self.__buried[index]
+            return
+        row, column = self.__get_own_row(index)
+        if row[column] is not entity:
+            return
+        if index in self.__buried:
+            row[column] = self.__buried.pop(index)
+            return
+        row[column] = None
+        self.__change_population(position, -1)
+
+    def replace(
+        self,
+        position: PositionSquare | PositionHexagon,
+        entity: "organism.Organism",
+        replacement: "organism.Organism",
+    ) -> None:
+        index = self.__get_valid_index(position[0], position[1])
+        if index is None:
+            return
+        if self.__buried.get(index) is entity:
+            self.__buried[index] = replacement
+            return
+        row, column = self.__get_own_row(index)
+        if row[column] is entity:
+            row[column] = replacement
+
+    def __change_population(
+        self, position: PositionSquare | PositionHexagon, change: int
+    ) -> None:
+        chunk_key = self.get_chunk_key(position)
+        population = self.__chunk_populations.get(chunk_key, 0) + change
+        if population:
+            self.__chunk_populations[chunk_key] = population
+        else:
+            del self.__chunk_populations[chunk_key]
+        self.__size += change
+
+    def clear(self) -> None:
+        self.__rows = [
+            [None] * self.__columns for _ in range(len(self.__valid) // self.__columns)
+        ]
+        self.__chunk_populations = {}
+        self.__buried = {}
+        self.__shared = set()
+        self.__size = 0
+
+    def fork(self) -> "HexagonalGrid":
+        # Both grids keep the rows they had and copy one only when it is
+        # changed, so a fork costs one entry per row.
+        grid = HexagonalGrid.__new__(HexagonalGrid)
+        grid.__chunk_size = self.__chunk_size
+        grid.__half_width = self.__half_width
+        grid.__half_height = self.__half_height
+        grid.__columns = self.__columns
+        grid.__valid = self.__valid
+        grid.__rows = self.__rows.copy()
+        grid.__chunk_populations = self.__chunk_populations.copy()
+        grid.__buried = self.__buried.copy()
+        grid.__size = self.__size
+        grid.__shared = set(range(len(self.__rows)))
+        self.__shared = set(range(len(self.__rows)))
+        return grid
+
+    def get_chunk_size(self) -> int:
+        return self.__chunk_size
+
+    def get_chunk_keys(self) -> list[tuple[int, int]]:
+        return list(self.__chunk_populations)
+
+    def get_chunk_populations(self) -> dict[tuple[int, int], int]:
+        return self.__chunk_populations.copy()
+
+    def get_entities_in_area(
+        self, first: tuple[int, int], last: tuple[int, int]
+    ) -> Iterator["organism.Organism"]:
+        first_q = max(first[0], -self.__half_width)
+        last_q = min(last[0], self.__half_width - 1)
+        if first_q > last_q:
+            return
+        for r in range(
+            max(first[1], -self.__half_height), min(last[1], self.__half_height - 1) + 1
+        ):
+            row = self.__rows[r + self.__half_height]
+            for entity in row[
+                first_q + self.__half_width : last_q + self.__half_width + 1
+            ]:
+                if entity is not None:
+                    yield entity
+
+    def __len__(self) -> int:
+        return self.__size
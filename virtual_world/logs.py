@@ -0,0 +1,71 @@
+from enum import Enum
+from typing import Generic, Iterator, Optional, TypeVar
+
+from virtual_world.config import Config
+
+T = TypeVar("T")
+
+
+class LogEventType(Enum):
+    FIGHT = 0
+    REPRODUCTION = 1
+    ABILITY = 2
+    MOVEMENT = 3
+    OTHER = 4
+
+
+class RingBuffer(Generic[T]):
+    __items: list[Optional[T]]
+    __start: int
+    __size: int
+    __count: int
+
+    def __init__(self, capacity: int = Config.LOG_CAPACITY) -> None:
+        self.__items = [None] * capacity
+        self.__start = 0
+        self.__size = 0
+        self.__count = 0
+
+    def append(self, item: T) -> None:
+        capacity = len(self.__items)
+        self.__items[(self.__start + self.__size) % capacity] = item
+        if self.__size < capacity:
+            self.__size += 1
+        else:
+            self.__start = (self.__start + 1) % capacity
+        self.__count += 1
+
+    def clear(self) -> None:
+        self.__items = [None] * len(self.__items)
+        self.__start = 0
+        self.__size = 0
+
+    def copy(self) -> "RingBuffer[T]":
+        ring_buffer: RingBuffer[T] = RingBuffer(len(self.__items))
+        ring_buffer.__items = self.__items.copy()
+        ring_buffer.__start = self.__start
+        ring_buffer.__size = self.__size
+        ring_buffer.__count = self.__count
+        return ring_buffer
+
+    def get_capacity(self) -> int:
+        return len(self.__items)
+
+    def get_count(self) -> int:
+        return self.__count
+
+    def get_since(self, count: int) -> list[T]:
+        first = max(0, self.__size - (self.__count - count))
+        return [self[index] for index in range(first, self.__size)]
+
+    def __getitem__(self, index: int) -> T:
+        if not 0 <= index < self.__size:
+            raise IndexError("Ring buffer index out of range")
+        return self.__items[(self.__start + index) % len(self.__items)]  # type: ignore # return-value
+
+    def __iter__(self) -> Iterator[T]:
+        for index in range(self.__size):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return self.__size
@@ -0,0 +1,38 @@
+import sys
+from typing import TypedDict
+
+from virtual_world.organisms.organism import Organism
+from virtual_world.world import World
+
+
+class SpeciesMemory(TypedDict):
+    count: int
+    bytes: int
+
+
+def get_organism_size(organism: Organism) -> int:
+    return sys.getsizeof(organism) + sys.getsizeof(organism.get_position())
+
+
+def get_memory_report(world: World) -> dict[str, SpeciesMemory]:
+    report: dict[str, SpeciesMemory] = {}
+    for entity in world.get_entities():
+        species = report.setdefault(entity.__class__.__name__, {"count": 0, "bytes": 0})
+        species["count"] += 1
+        species["bytes"] += get_organism_size(entity)
+    return dict(sorted(report.items()))
+
+
+def print_memory_report(world: World) -> None:
+    report = get_memory_report(world)
+    print(f"{'species':<20}{'count':>10}{'bytes/organism':>16}{'total bytes':>14}")
+    for species, memory in report.items():
+        print(
+            f"{species:<20}{memory['count']:>10}"
+            f"{memory['bytes'] / memory['count']:>16.1f}{memory['bytes']:>14}"
+        )
+    count = sum(memory["count"] for memory in report.values())
+    total = sum(memory["bytes"] for memory in report.values())
+    print(
+        f"{'total':<20}{count:>10}" f"{total / count if count else 0:>16.1f}{total:>14}"
+    )
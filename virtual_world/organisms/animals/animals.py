@@ -1,13 +1,19 @@
-import random
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from virtual_world.config import Config
+from virtual_world.logs import LogEventType
 from virtual_world.organisms.collision_result import CollisionResult
 from virtual_world.organisms.direction import DirectionSquare, DirectionHexagon
-from virtual_world.organisms.organism import Organism
+from virtual_world.organisms.organism import Attack, Defence, Organism
+from virtual_world.organisms.plants.plants import HeracleumSosnowskyi
+from virtual_world.organisms.position import PositionSquare, PositionHexagon
 
 
 class Animal(Organism):
+    __slots__ = ()
+
+    _harmed_by_heracleum = True
+
     def action(
         self, direction: Optional[DirectionSquare | DirectionHexagon] = None
     ) -> None:
@@ -23,29 +29,73 @@ class Animal(Organism):
             return
 
         new_position = self._world.get_position_in_direction(self._position, direction)
+        self.move_towards(new_position)
+
+    def decide(
+        self, direction: Optional[DirectionSquare | DirectionHexagon] = None
+    ) -> list[PositionSquare | PositionHexagon]:
+        if direction is None:
+            direction = self._world.get_random_direction()
+
+        if direction in (DirectionSquare.NONE, DirectionHexagon.NONE):
+            return []
+
+        return [self._world.get_position_in_direction(self._position, direction)]
+
+    def resolve(self, targets: list[PositionSquare | PositionHexagon]) -> None:
+        for target in targets:
+            if not self._alive:
+                return
+            self.move_towards(target)
 
+    def move_towards(self, new_position: PositionSquare | PositionHexagon) -> None:
         if self._world.is_position_in_world(new_position):
             other_organism = self._world.get_organism_at_position(new_position)
 
             if other_organism is None:
                 self._world.move_organism(self, new_position)
             else:
-                if other_organism.__class__.__name__ == self.__class__.__name__:
+                if other_organism.is_same_species(self):
                     self.reproduce(other_organism)
                 else:
+                    tracer = self._world.get_tracer()
+                    if tracer is not None:
+                        tracer.begin("collision", "world")
                     collision_result = self.collision(other_organism)
                     if collision_result == CollisionResult.VICTORY:
                         self._world.move_organism(self, new_position)
-                        self._world.add_log(f"{self} killed {other_organism}")
+                        self._world.add_log(
+                            "{} killed {}",
+                            self,
+                            other_organism,
+                            event_type=LogEventType.FIGHT,
+                        )
                         other_organism.die()
                     elif collision_result == CollisionResult.DEFEAT:
-                        self._world.add_log(f"{self} was killed by {other_organism}")
+                        self._world.add_log(
+                            "{} was killed by {}",
+                            self,
+                            other_organism,
+                            event_type=LogEventType.FIGHT,
+                        )
                         self.die()
                     elif collision_result == CollisionResult.ESCAPE:
-                        self._world.add_log(f"{self} escaped from {other_organism}")
+                        self._world.add_log(
+                            "{} escaped from {}",
+                            self,
+                            other_organism,
+                            event_type=LogEventType.FIGHT,
+                        )
                         self._world.move_organism(self, new_position)
                     elif collision_result == CollisionResult.TIE:
-                        self._world.add_log(f"{self} tied with {other_organism}")
+                        self._world.add_log(
+                            "{} tied with {}",
+                            self,
+                            other_organism,
+                            event_type=LogEventType.FIGHT,
+                        )
+                    if tracer is not None:
+                        tracer.end("collision", "world")
 
     def reproduce(self, other: "Organism") -> None:
         new_position = self._world.get_random_adjacent_position(
@@ -54,92 +104,180 @@ class Animal(Organism):
         if new_position is None:
             return
         if self._world.is_position_in_world(new_position):
-            self._world.add_log(f"{self} reproduced with {other}")
+            self._world.add_log(
+                "{} reproduced with {}",
+                self,
+                other,
+                event_type=LogEventType.REPRODUCTION,
+            )
             self._world.add_entity(self.__class__(new_position))
 
 
 class Sheep(Animal):
-    _strength = Config.SHEEP_STRENGTH
+    __slots__ = ()
+
+    _base_strength = Config.SHEEP_STRENGTH
     _initiative = Config.SHEEP_INITIATIVE
     _color = Config.SHEEP_COLOR
 
 
 class Wolf(Animal):
-    _strength = Config.WOLF_STRENGTH
+    __slots__ = ()
+
+    _base_strength = Config.WOLF_STRENGTH
     _initiative = Config.WOLF_INITIATIVE
     _color = Config.WOLF_COLOR
 
 
 class Turtle(Animal):
-    _strength = Config.TURTLE_STRENGTH
+    __slots__ = ()
+
+    _base_strength = Config.TURTLE_STRENGTH
     _initiative = Config.TURTLE_INITIATIVE
     _color = Config.TURTLE_COLOR
+    _activity_chance = Config.TURTLE_MOVE_CHANCE
 
     def action(
         self, direction: Optional[DirectionSquare | DirectionHexagon] = None
     ) -> None:
-        if random.random() < Config.TURTLE_MOVE_CHANCE:
+        if self._world.get_random().random() < Config.TURTLE_MOVE_CHANCE:
             super().action(direction)
-        self._world.add_log(f"{self} is too lazy to move")
+        self._world.add_log(
+            "{} is too lazy to move", self, event_type=LogEventType.MOVEMENT
+        )
 
-    def collision(self, other: Organism, is_attacked: bool = False) -> CollisionResult:
-        if (
-            other.__class__.__name__ != "Turtle"
-            and other.get_strength() < Config.TURTLE_REFLECTION_STRENGTH
-        ):
-            self._world.add_log(f"{self} reflected attack from {other}")
+    def active_action(self) -> None:
+        super().action()
+
+    def decide(
+        self, direction: Optional[DirectionSquare | DirectionHexagon] = None
+    ) -> list[PositionSquare | PositionHexagon]:
+        if self._world.get_random().random() < Config.TURTLE_MOVE_CHANCE:
+            return super().decide(direction)
+        self._world.add_log(
+            "{} is too lazy to move", self, event_type=LogEventType.MOVEMENT
+        )
+        return []
+
+    @classmethod
+    def get_attack(cls, defender: type[Organism]) -> Attack:
+        if issubclass(defender, cls):
+            return super().get_attack(defender)
+        return cls.attack_reflecting
+
+    @classmethod
+    def get_defence(cls, attacker: type[Organism]) -> Defence:
+        if issubclass(attacker, cls):
+            return super().get_defence(attacker)
+        return cls.defend_reflecting
+
+    @staticmethod
+    def attack_reflecting(
+        attacker: Organism, defender: Organism, defence: Defence
+    ) -> CollisionResult:
+        if defender.get_strength() < Config.TURTLE_REFLECTION_STRENGTH:
+            attacker.get_world().add_log(
+                "{} reflected attack from {}",
+                attacker,
+                defender,
+                event_type=LogEventType.FIGHT,
+            )
             return CollisionResult.TIE
-        return super().collision(other, is_attacked)
+        return Organism.attack(attacker, defender, defence)
+
+    @staticmethod
+    def defend_reflecting(defender: Organism, attacker: Organism) -> CollisionResult:
+        if attacker.get_strength() < Config.TURTLE_REFLECTION_STRENGTH:
+            defender.get_world().add_log(
+                "{} reflected attack from {}",
+                defender,
+                attacker,
+                event_type=LogEventType.FIGHT,
+            )
+            return CollisionResult.TIE
+        return Organism.defend(defender, attacker)
 
 
 class Fox(Animal):
-    _strength = Config.FOX_STRENGTH
+    __slots__ = ()
+
+    _base_strength = Config.FOX_STRENGTH
     _initiative = Config.FOX_INITIATIVE
     _color = Config.FOX_COLOR
 
     def action(
         self, direction: Optional[DirectionSquare | DirectionHexagon] = None
     ) -> None:
-        possible_directions = self.get_possible_directions()
-        if isinstance(direction, DirectionSquare):
-            possible_directions.remove(DirectionSquare.NONE)
-        elif isinstance(direction, DirectionHexagon):
-            possible_directions.remove(DirectionHexagon.NONE)
-        possible_directions_filtered = []
-        for possible_direction in possible_directions:
-            new_position = self._world.get_position_in_direction(
-                self._position, possible_direction
+        safe_directions = self.get_safe_directions(direction)
+        if len(safe_directions) == 0:
+            self._world.add_log(
+                "There is no place for {} to move",
+                self,
+                event_type=LogEventType.MOVEMENT,
             )
-            if self._world.is_position_in_world(new_position):
-                other_organism = self._world.get_organism_at_position(new_position)
-                if other_organism is None:
-                    possible_directions_filtered.append(possible_direction)
-                elif self.is_stronger(other_organism):
-                    possible_directions_filtered.append(possible_direction)
-
-        if len(possible_directions_filtered) == 0:
-            self._world.add_log(f"There is no place for {self} to move")
         else:
-            super().action(random.choice(possible_directions_filtered))
+            super().action(self._world.get_random().choice(safe_directions))
+
+    def decide(
+        self, direction: Optional[DirectionSquare | DirectionHexagon] = None
+    ) -> list[PositionSquare | PositionHexagon]:
+        safe_directions = self.get_safe_directions(direction)
+        if len(safe_directions) == 0:
+            self._world.add_log(
+                "There is no place for {} to move",
+                self,
+                event_type=LogEventType.MOVEMENT,
+            )
+            return []
+        return super().decide(self._world.get_random().choice(safe_directions))
+
+    def get_safe_directions(
+        self, direction: Optional[DirectionSquare | DirectionHexagon] = None
+    ) -> list[DirectionSquare | DirectionHexagon]:
+        return self._world.get_safe_directions(self._position, self._strength)
 
 
 class Human(Animal):
-    _strength = Config.HUMAN_STRENGTH
+    __slots__ = (
+        "_special_ability_cooldown",
+        "_special_ability_duration",
+        "_special_ability_active",
+    )
+
+    _base_strength = Config.HUMAN_STRENGTH
     _initiative = Config.HUMAN_INITIATIVE
     _color = Config.HUMAN_COLOR
-    _special_ability_cooldown = 0
-    _special_ability_duration = 0
-    _special_ability_active = False
+    _special_ability_cooldown: int
+    _special_ability_duration: int
+    _special_ability_active: bool
+
+    def __init__(
+        self, position: PositionSquare | PositionHexagon = PositionSquare(0, 0)
+    ) -> None:
+        super().__init__(position)
+        self._special_ability_cooldown = 0
+        self._special_ability_duration = 0
+        self._special_ability_active = False
 
     def use_special_ability(self) -> None:
         if self._special_ability_cooldown == 0 and not self._special_ability_active:
             self._special_ability_duration = Config.HUMAN_ABILITY_DURATION
             self._special_ability_active = True
-            self._world.add_log(f"{self} used special ability")
+            self._world.add_log(
+                "{} used special ability", self, event_type=LogEventType.ABILITY
+            )
 
     def action(
         self, direction: Optional[DirectionSquare | DirectionHexagon] = None
     ) -> None:
+        self.update_special_ability()
+        super().action(direction)
+
+    def resolve(self, targets: list[PositionSquare | PositionHexagon]) -> None:
+        self.update_special_ability()
+        super().resolve(targets)
+
+    def update_special_ability(self) -> None:
         self.perform_special_ability()
 
         if self._special_ability_active:
@@ -147,32 +285,48 @@ class Human(Animal):
             if self._special_ability_duration == 0:
                 self._special_ability_cooldown = Config.HUMAN_ABILITY_COOLDOWN
                 self._special_ability_active = False
-                self._world.add_log(f"{self} special ability ended")
+                self._world.add_log(
+                    "{} special ability ended", self, event_type=LogEventType.ABILITY
+                )
         else:
             self._special_ability_cooldown -= 1
             if self._special_ability_cooldown < 0:
                 self._special_ability_cooldown = 0
             if self._special_ability_cooldown == 0:
-                self._world.add_log(f"{self} special ability is ready")
-
-        super().action(direction)
+                self._world.add_log(
+                    "{} special ability is ready", self, event_type=LogEventType.ABILITY
+                )
 
     def perform_special_ability(self) -> None:
         if self._special_ability_active:
             neighbors = self._world.get_all_neighbours(self._position)
             for neighbor in neighbors:
                 neighbor.die()
-                self._world.add_log(f"{self} killed {neighbor} with special ability")
+                self._world.add_log(
+                    "{} killed {} with special ability",
+                    self,
+                    neighbor,
+                    event_type=LogEventType.ABILITY,
+                )
 
     def get_special_ability_cooldown(self) -> int:
         return self._special_ability_cooldown
 
+    def set_special_ability_cooldown(self, cooldown: int) -> None:
+        self._special_ability_cooldown = cooldown
+
     def get_special_ability_duration(self) -> int:
         return self._special_ability_duration
 
+    def set_special_ability_duration(self, duration: int) -> None:
+        self._special_ability_duration = duration
+
     def get_special_ability_active(self) -> bool:
         return self._special_ability_active
 
+    def set_special_ability_active(self, active: bool) -> None:
+        self._special_ability_active = active
+
     class HumanRepresentation(Organism.OrganismRepresentation):
         special_ability_cooldown: int
         special_ability_duration: int
@@ -193,9 +347,24 @@ class Human(Animal):
         self._special_ability_duration = data["special_ability_duration"]  # type: ignore
         self._special_ability_active = data["special_ability_active"]  # type: ignore
 
+    def __getstate__(self) -> dict[str, Any]:
+        state = super().__getstate__()
+        state["special_ability_cooldown"] = self._special_ability_cooldown
+        state["special_ability_duration"] = self._special_ability_duration
+        state["special_ability_active"] = self._special_ability_active
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        super().__setstate__(state)
+        self._special_ability_cooldown = state["special_ability_cooldown"]
+        self._special_ability_duration = state["special_ability_duration"]
+        self._special_ability_active = state["special_ability_active"]
+
 
 class Antelope(Animal):
-    _strength = Config.ANTELOPE_STRENGTH
+    __slots__ = ()
+
+    _base_strength = Config.ANTELOPE_STRENGTH
     _initiative = Config.ANTELOPE_INITIATIVE
     _color = Config.ANTELOPE_COLOR
 
@@ -205,51 +374,122 @@ class Antelope(Animal):
         for i in range(Config.ANTELOPE_MOVE_RANGE):
             super().action(direction)
 
-    def collision(self, other: Organism, is_attacked: bool = False) -> CollisionResult:
-        escape_position = self._world.get_random_adjacent_position(
-            self._position, empty=True
+    def decide(
+        self, direction: Optional[DirectionSquare | DirectionHexagon] = None
+    ) -> list[PositionSquare | PositionHexagon]:
+        targets: list[PositionSquare | PositionHexagon] = []
+        position = self._position
+        for i in range(Config.ANTELOPE_MOVE_RANGE):
+            step_direction = direction or self._world.get_random_direction()
+            if step_direction in (DirectionSquare.NONE, DirectionHexagon.NONE):
+                break
+            position = self._world.get_position_in_direction(position, step_direction)
+            if not self._world.is_position_in_world(position):
+                break
+            targets.append(position)
+            if self._world.get_organism_at_position(position) is not None:
+                break
+        return targets
+
+    def resolve(self, targets: list[PositionSquare | PositionHexagon]) -> None:
+        for target in targets:
+            previous_position = self._position
+            super().resolve([target])
+            if self._position == previous_position:
+                return
+
+    @classmethod
+    def get_attack(cls, defender: type[Organism]) -> Attack:
+        return cls.attack_escaping
+
+    @classmethod
+    def get_defence(cls, attacker: type[Organism]) -> Defence:
+        return cls.defend_escaping
+
+    @staticmethod
+    def attack_escaping(
+        attacker: Organism, defender: Organism, defence: Defence
+    ) -> CollisionResult:
+        return Antelope.escape(
+            attacker, defender, lambda: Organism.attack(attacker, defender, defence)
+        )
+
+    @staticmethod
+    def defend_escaping(defender: Organism, attacker: Organism) -> CollisionResult:
+        return Antelope.escape(
+            defender, attacker, lambda: Organism.defend(defender, attacker)
         )
-        if escape_position is None:
-            return super().collision(other, is_attacked)
 
-        if super().collision(other, is_attacked) == CollisionResult.DEFEAT:
-            if random.random() < Config.ANTELOPE_ESCAPE_CHANCE:
-                self._world.add_log(f"{self} escaped from {other}")
-                self._world.move_organism(self, escape_position)
+    @staticmethod
+    def escape(
+        antelope: Organism, other: Organism, collide: Callable[[], CollisionResult]
+    ) -> CollisionResult:
+        world = antelope.get_world()
+        escape_position = world.get_random_adjacent_position(
+            antelope.get_position(), empty=True
+        )
+        if escape_position is None:
+            return collide()
+
+        if collide() == CollisionResult.DEFEAT:
+            if world.get_random().random() < Config.ANTELOPE_ESCAPE_CHANCE:
+                world.add_log(
+                    "{} escaped from {}", antelope, other, event_type=LogEventType.FIGHT
+                )
+                world.move_organism(antelope, escape_position)
                 return CollisionResult.ESCAPE
 
-        return super().collision(other, is_attacked)
+        return collide()
 
 
 class CyberSheep(Animal):
-    _strength = Config.CYBER_SHEEP_STRENGTH
+    __slots__ = ()
+
+    _harmed_by_heracleum = False
+    _base_strength = Config.CYBER_SHEEP_STRENGTH
     _initiative = Config.CYBER_SHEEP_INITIATIVE
     _color = Config.CYBER_SHEEP_COLOR
 
     def action(
         self, direction: Optional[DirectionSquare | DirectionHexagon] = None
     ) -> None:
-        from virtual_world.organisms.plants.plants import HeracleumSosnowskyi
+        super().action(self.get_hunting_direction(direction))
 
+    def decide(
+        self, direction: Optional[DirectionSquare | DirectionHexagon] = None
+    ) -> list[PositionSquare | PositionHexagon]:
+        return super().decide(self.get_hunting_direction(direction))
+
+    def get_hunting_direction(
+        self, direction: Optional[DirectionSquare | DirectionHexagon] = None
+    ) -> Optional[DirectionSquare | DirectionHexagon]:
         closest_heracleum_sosnowskyi = self._world.get_closest_organism_of_type(
             self.get_position(), HeracleumSosnowskyi
         )
         if closest_heracleum_sosnowskyi is None:
-            super().action(direction)
-        else:
-            self._world.add_log(f"{self} is going to {closest_heracleum_sosnowskyi}")
-            direction = self._world.get_direction_to_position(
-                self._position, closest_heracleum_sosnowskyi.get_position()
-            )
-            super().action(direction)
+            return direction
+        self._world.add_log(
+            "{} is going to {}",
+            self,
+            closest_heracleum_sosnowskyi,
+            event_type=LogEventType.MOVEMENT,
+        )
+        return self._world.get_direction_to_position(
+            self._position, closest_heracleum_sosnowskyi.get_position()
+        )
 
-    def collision(
-        self, other: "Organism", is_attacked: bool = False
-    ) -> CollisionResult:
-        from virtual_world.organisms.plants.plants import HeracleumSosnowskyi
+    @classmethod
+    def get_attack(cls, defender: type[Organism]) -> Attack:
+        if issubclass(defender, HeracleumSosnowskyi):
+            return cls.eat
+        return super().get_attack(defender)
 
-        if isinstance(other, HeracleumSosnowskyi):
-            self._world.add_log(f"{self} ate {other}")
-            other.die()
-            return CollisionResult.VICTORY
-        return super().collision(other, is_attacked)
+    @staticmethod
+    def eat(
+        attacker: Organism, defender: Organism, defence: Defence
+    ) -> CollisionResult:
+        attacker.get_world().add_log(
+            "{} ate {}", attacker, defender, event_type=LogEventType.FIGHT
+        )
+        defender.die()
+        return CollisionResult.VICTORY
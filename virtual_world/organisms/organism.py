@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import Optional, Tuple, TypedDict
+from typing import Any, Callable, Optional, Tuple, TypedDict
 
 from virtual_world.organisms.collision_result import CollisionResult
 from virtual_world.organisms.direction import (
@@ -8,49 +8,141 @@ from virtual_world.organisms.direction import (
 )
 from virtual_world.organisms.position import PositionSquare, PositionHexagon
 
+Defence = Callable[["Organism", "Organism"], CollisionResult]
+Attack = Callable[["Organism", "Organism", Defence], CollisionResult]
+
 
 class Organism(ABC):
     import virtual_world.world as world
 
-    _strength: int
+    # Species constants stay on the classes, only the state that changes per
+    # organism gets a slot.
+    __slots__ = (
+        "_strength",
+        "_birth_turn",
+        "_position",
+        "_alive",
+        "_id",
+        "_sequence",
+        "_world",
+        "_generation",
+    )
+
+    _species: list[type["Organism"]] = []
+    _collisions: list[list[tuple[Attack, Defence]]] = []
+    _species_id: int
+    _harmed_by_heracleum: bool = False
+    _poisons_neighbours: bool = False
+    _activity_chance: Optional[float] = None
+    _base_strength: int
     _initiative: int
     _color: Tuple[int, int, int]
-    _age: int = 0
+    _strength: int
+    _birth_turn: int
     _position: PositionSquare | PositionHexagon
-    _alive: bool = True
+    _alive: bool
+    _id: Optional[int]
+    _sequence: int
     _world: "world.World"
+    _generation: Optional[int]
 
     def __init__(
         self, position: PositionSquare | PositionHexagon = PositionSquare(0, 0)
     ) -> None:
+        self._strength = self._base_strength
         self._position = position
         self._alive = True
-        self._age = 0
+        self._birth_turn = 0
+        self._id = None
+        self._sequence = 0
+        self._generation = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        Organism.register_species(cls)
+
+    @staticmethod
+    def register_species(species: type["Organism"]) -> None:
+        species._species_id = len(Organism._species)
+        Organism._species.append(species)
+        Organism._collisions = [
+            [
+                (attacker.get_attack(defender), defender.get_defence(attacker))
+                for defender in Organism._species
+            ]
+            for attacker in Organism._species
+        ]
+
+    @classmethod
+    def get_attack(cls, defender: type["Organism"]) -> Attack:
+        return Organism.attack
+
+    @classmethod
+    def get_defence(cls, attacker: type["Organism"]) -> Defence:
+        return Organism.defend
+
+    @staticmethod
+    def attack(
+        attacker: "Organism", defender: "Organism", defence: Defence
+    ) -> CollisionResult:
+        collision_result = defence(defender, attacker)
+        if attacker._strength > defender._strength and collision_result in (
+            CollisionResult.TIE,
+            CollisionResult.ESCAPE,
+        ):
+            return collision_result
+        if attacker._strength >= defender._strength:
+            return CollisionResult.VICTORY
+        return CollisionResult.DEFEAT
+
+    @staticmethod
+    def defend(defender: "Organism", attacker: "Organism") -> CollisionResult:
+        if defender._strength > attacker._strength:
+            return CollisionResult.VICTORY
+        return CollisionResult.DEFEAT
 
     def action(
         self, direction: Optional[DirectionSquare | DirectionHexagon] = None
     ) -> None:
         pass
 
+    def active_action(self) -> None:
+        self.action()
+
+    def decide(
+        self, direction: Optional[DirectionSquare | DirectionHexagon] = None
+    ) -> list[PositionSquare | PositionHexagon]:
+        return []
+
+    def resolve(self, targets: list[PositionSquare | PositionHexagon]) -> None:
+        pass
+
     def collision(
         self, other: "Organism", is_attacked: bool = False
     ) -> CollisionResult:
-        if not is_attacked:
-            collision_result = other.collision(self, True)
-            if self.is_stronger(other) and collision_result in (  # type: ignore # comparison-overlap
-                collision_result.TIE,
-                collision_result.ESCAPE,
-            ):
-                return collision_result
-        if self.is_stronger(other, is_attacked):
-            return CollisionResult.VICTORY
-        else:
-            return CollisionResult.DEFEAT
+        if is_attacked:
+            return Organism._collisions[other._species_id][self._species_id][1](
+                self, other
+            )
+        attack, defence = Organism._collisions[self._species_id][other._species_id]
+        return attack(self, other, defence)
+
+    def is_same_species(self, other: "Organism") -> bool:
+        return self._species_id == other._species_id
+
+    def is_harmed_by_heracleum(self) -> bool:
+        return self._harmed_by_heracleum
+
+    def poisons_neighbours(self) -> bool:
+        return self._poisons_neighbours
+
+    def get_activity_chance(self) -> Optional[float]:
+        return self._activity_chance
 
     def get_possible_directions(self) -> list[DirectionSquare | DirectionHexagon]:
-        if self._position.__class__.__name__ == "PositionSquare":
+        if isinstance(self._position, PositionSquare):
             return list(filter(lambda d: d != DirectionSquare.NONE, DirectionSquare))
-        elif self._position.__class__.__name__ == "PositionHexagon":
+        elif isinstance(self._position, PositionHexagon):
             return list(filter(lambda d: d != DirectionHexagon.NONE, DirectionHexagon))
         else:
             raise ValueError("Unknown position type")
@@ -62,7 +154,7 @@ class Organism(ABC):
 
     def has_higher_initiative(self, other: "Organism") -> bool:
         if self._initiative == other.get_initiative():
-            return self._age > other.get_age()
+            return self.get_age() > other.get_age()
         return self._initiative > other.get_initiative()
 
     def get_initiative(self) -> int:
@@ -73,6 +165,9 @@ class Organism(ABC):
 
     def increase_strength(self, strength: int) -> None:
         self._strength += strength
+        world = getattr(self, "_world", None)
+        if world is not None:
+            world.record_strength_change(self)
 
     def get_position(self) -> PositionSquare | PositionHexagon:
         return self._position
@@ -81,13 +176,26 @@ class Organism(ABC):
         self._position = position
 
     def get_age(self) -> int:
-        return self._age
+        # The age is counted from the world's aging clock, so a world can age
+        # every organism at once by advancing the clock.
+        try:
+            return self._world.get_aging_turn() - self._birth_turn
+        except AttributeError:
+            return -self._birth_turn
+
+    def set_age(self, age: int) -> None:
+        self._birth_turn += self.get_age() - age
 
     def increase_age(self) -> None:
-        self._age += 1
+        self._birth_turn -= 1
 
     def die(self) -> None:
+        if not self._alive:
+            return
         self._alive = False
+        world = getattr(self, "_world", None)
+        if world is not None:
+            world.record_death(self)
 
     def is_alive(self) -> bool:
         return self._alive
@@ -95,12 +203,38 @@ class Organism(ABC):
     def get_color(self) -> Tuple[int, int, int]:
         return self._color
 
+    @classmethod
+    def get_species_color(cls) -> Tuple[int, int, int]:
+        return cls._color
+
+    def get_id(self) -> Optional[int]:
+        return self._id
+
+    def set_id(self, entity_id: Optional[int]) -> None:
+        self._id = entity_id
+
+    def get_sequence(self) -> int:
+        return self._sequence
+
+    def set_sequence(self, sequence: int) -> None:
+        self._sequence = sequence
+
     def set_world(self, world: "world.World") -> None:
+        # The birth turn moves to the new world's aging clock, which keeps the
+        # age the same.
+        previous_world = getattr(self, "_world", None)
+        if previous_world is not None:
+            self._birth_turn -= previous_world.get_aging_turn()
+        self._birth_turn += world.get_aging_turn()
         self._world = world
+        self._generation = world.get_generation()
 
     def get_world(self) -> "world.World":
         return self._world
 
+    def get_generation(self) -> Optional[int]:
+        return self._generation
+
     class OrganismRepresentation(TypedDict):
         strength: int
         initiative: int
@@ -114,7 +248,7 @@ class Organism(ABC):
         return {
             "strength": self._strength,
             "initiative": self._initiative,
-            "age": self._age,
+            "age": self.get_age(),
             "position": self._position.__dict__(),
             "alive": self._alive,
             "color": self._color,
@@ -123,14 +257,34 @@ class Organism(ABC):
 
     def set_from_dict(self, data: OrganismRepresentation) -> None:
         self._strength = data["strength"]
-        self._initiative = data["initiative"]
-        self._age = data["age"]
+        self.set_age(data["age"])
         if len(data["position"]) == 2:
             self._position = PositionSquare(**data["position"])
         elif len(data["position"]) == 3:
             self._position = PositionHexagon(**data["position"])
         self._alive = data["alive"]
-        self._color = data["color"]
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "strength": self._strength,
+            "birth_turn": self._birth_turn,
+            "position": self._position,
+            "alive": self._alive,
+            "id": self._id,
+            "sequence": self._sequence,
+            "world": getattr(self, "_world", None),
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._strength = state["strength"]
+        self._birth_turn = state["birth_turn"]
+        self._position = state["position"]
+        self._alive = state["alive"]
+        self._id = state["id"]
+        self._sequence = state["sequence"]
+        self._generation = None
+        if state["world"] is not None:
+            self._world = state["world"]
 
     def __str__(self) -> str:
         return self.__class__.__name__
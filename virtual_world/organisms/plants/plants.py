@@ -1,40 +1,93 @@
-import random
 from typing import Optional
 
 from virtual_world.config import Config
+from virtual_world.logs import LogEventType
 from virtual_world.organisms.collision_result import CollisionResult
 from virtual_world.organisms.direction import DirectionSquare, DirectionHexagon
-from virtual_world.organisms.organism import Organism
+from virtual_world.organisms.organism import Attack, Defence, Organism
+from virtual_world.organisms.position import PositionSquare, PositionHexagon
 
 
 class Plant(Organism):
+    __slots__ = ()
+
     _initiative = Config.PLANT_INITIATIVE
+    _activity_chance: Optional[float] = Config.PLANT_SPREAD_CHANCE
 
     def action(
         self, direction: Optional[DirectionSquare | DirectionHexagon] = None
     ) -> None:
-        if random.random() < Config.PLANT_SPREAD_CHANCE:
+        if self._world.get_random().random() < Config.PLANT_SPREAD_CHANCE:
+            self.spread()
+
+    def active_action(self) -> None:
+        self.spread()
+
+    def spread(self) -> None:
+        new_position = self._world.get_random_adjacent_position(
+            self._position, empty=True
+        )
+        if new_position is not None and self._world.is_position_in_world(new_position):
+            self.spread_to(new_position)
+
+    def decide(
+        self, direction: Optional[DirectionSquare | DirectionHexagon] = None
+    ) -> list[PositionSquare | PositionHexagon]:
+        if self._world.get_random().random() < Config.PLANT_SPREAD_CHANCE:
             new_position = self._world.get_random_adjacent_position(
                 self._position, empty=True
             )
             if new_position is not None and self._world.is_position_in_world(
                 new_position
             ):
-                self._world.add_entity(self.__class__(new_position))
-                self._world.add_log(f"{self} spread to {new_position}")
-
-    def collision(self, other: Organism, is_attacked: bool = False) -> CollisionResult:
+                return [new_position]
+        return []
+
+    def resolve(self, targets: list[PositionSquare | PositionHexagon]) -> None:
+        for target in targets:
+            if self._world.get_entity(target) is None:
+                self.spread_to(target)
+
+    def spread_to(self, position: PositionSquare | PositionHexagon) -> None:
+        self._world.add_entity(self.__class__(position))
+        self._world.add_log(
+            "{} spread to {}", self, position, event_type=LogEventType.REPRODUCTION
+        )
+
+    @classmethod
+    def get_attack(cls, defender: type[Organism]) -> Attack:
+        return cls.attack_passively
+
+    @classmethod
+    def get_defence(cls, attacker: type[Organism]) -> Defence:
+        return cls.defend_passively
+
+    @staticmethod
+    def attack_passively(
+        attacker: Organism, defender: Organism, defence: Defence
+    ) -> CollisionResult:
+        return attacker.collision(defender, True)
+
+    @staticmethod
+    def defend_passively(defender: Organism, attacker: Organism) -> CollisionResult:
         return CollisionResult.DEFEAT
 
 
 class Grass(Plant):
-    _strength = Config.GRASS_STRENGTH
+    __slots__ = ()
+
+    _base_strength = Config.GRASS_STRENGTH
     _color = Config.GRASS_COLOR
 
 
 class Dandelion(Plant):
-    _strength = Config.DANDELION_STRENGTH
+    __slots__ = ()
+
+    _base_strength = Config.DANDELION_STRENGTH
     _color = Config.DANDELION_COLOR
+    _activity_chance = (
+        1 - (1 - Config.PLANT_SPREAD_CHANCE) ** Config.DANDELION_SPREAD_TRIES
+    )
 
     def action(
         self, direction: Optional[DirectionSquare | DirectionHexagon] = None
@@ -42,28 +95,67 @@ class Dandelion(Plant):
         for _ in range(Config.DANDELION_SPREAD_TRIES):
             super().action(direction)
 
+    def active_action(self) -> None:
+        # The tries are drawn again until at least one succeeds, which is the
+        # distribution of a turn that is known to spread.
+        spreads = [False]
+        while not any(spreads):
+            spreads = [
+                self._world.get_random().random() < Config.PLANT_SPREAD_CHANCE
+                for _ in range(Config.DANDELION_SPREAD_TRIES)
+            ]
+        for spread in spreads:
+            if spread:
+                self.spread()
+
+    def decide(
+        self, direction: Optional[DirectionSquare | DirectionHexagon] = None
+    ) -> list[PositionSquare | PositionHexagon]:
+        targets = []
+        for _ in range(Config.DANDELION_SPREAD_TRIES):
+            targets += super().decide(direction)
+        return targets
+
 
 class Guarana(Plant):
-    _strength = Config.GUARANA_STRENGTH
+    __slots__ = ()
+
+    _base_strength = Config.GUARANA_STRENGTH
     _color = Config.GUARANA_COLOR
 
-    def collision(self, other: Organism, is_attacked: bool = False) -> CollisionResult:
-        other.increase_strength(Config.GUARANA_STRENGTH_BOOST)
-        return super().collision(other, is_attacked)
+    @classmethod
+    def get_defence(cls, attacker: type[Organism]) -> Defence:
+        return cls.boost
+
+    @staticmethod
+    def boost(defender: Organism, attacker: Organism) -> CollisionResult:
+        attacker.increase_strength(Config.GUARANA_STRENGTH_BOOST)
+        return CollisionResult.DEFEAT
 
 
 class Belladonna(Plant):
-    _strength = Config.BELLADONNA_STRENGTH
+    __slots__ = ()
+
+    _base_strength = Config.BELLADONNA_STRENGTH
     _color = Config.BELLADONNA_COLOR
 
-    def collision(self, other: Organism, is_attacked: bool = False) -> CollisionResult:
-        other.die()
-        self.die()
-        return super().collision(other, is_attacked)
+    @classmethod
+    def get_defence(cls, attacker: type[Organism]) -> Defence:
+        return cls.poison
+
+    @staticmethod
+    def poison(defender: Organism, attacker: Organism) -> CollisionResult:
+        attacker.die()
+        defender.die()
+        return CollisionResult.DEFEAT
 
 
 class HeracleumSosnowskyi(Plant):
-    _strength = Config.HERACLEUM_SOSNOWSKYI_STRENGTH
+    __slots__ = ()
+
+    _poisons_neighbours = True
+    _activity_chance = None
+    _base_strength = Config.HERACLEUM_SOSNOWSKYI_STRENGTH
     _color = Config.HERACLEUM_SOSNOWSKYI_COLOR
 
     def action(
@@ -72,21 +164,23 @@ class HeracleumSosnowskyi(Plant):
         self.kill_adjacent()
         super().action(direction)
 
-    def kill_adjacent(self) -> None:
-        from virtual_world.organisms.animals.animals import Animal, CyberSheep
-
-        directions = self.get_possible_directions()
-        for direction in directions:
-            adjacent_position = self._world.get_position_in_direction(
-                self.get_position(), direction
-            )
-            organism = self._world.get_entity(adjacent_position)
-            if isinstance(organism, Animal) and not isinstance(organism, CyberSheep):
-                organism.die()
-
-    def collision(self, other: Organism, is_attacked: bool = False) -> CollisionResult:
-        from virtual_world.organisms.animals.animals import Animal, CyberSheep
+    def resolve(self, targets: list[PositionSquare | PositionHexagon]) -> None:
+        self.kill_adjacent()
+        super().resolve(targets)
 
-        if isinstance(other, Animal) and not isinstance(other, CyberSheep):
-            other.die()
-        return super().collision(other, is_attacked)
+    def kill_adjacent(self) -> None:
+        # The world keeps the victims of every hogweed and updates them as
+        # animals and hogweeds are added, moved or removed.
+        for organism in self._world.get_heracleum_victims(self):
+            organism.die()
+
+    @classmethod
+    def get_defence(cls, attacker: type[Organism]) -> Defence:
+        if attacker._harmed_by_heracleum:
+            return cls.burn
+        return super().get_defence(attacker)
+
+    @staticmethod
+    def burn(defender: Organism, attacker: Organism) -> CollisionResult:
+        attacker.die()
+        return CollisionResult.DEFEAT
@@ -6,6 +6,8 @@ class Position:
 
 
 class PositionSquare:
+    __slots__ = ("__x", "__y")
+
     __x: int
     __y: int
 
@@ -27,6 +29,9 @@ class PositionSquare:
     def __hash__(self) -> int:
         return hash((self.__x, self.__y))
 
+    def __reduce__(self) -> tuple[type["PositionSquare"], tuple[int, int]]:
+        return PositionSquare, (self.__x, self.__y)
+
     def __getitem__(self, item: int) -> int:
         return (self.__x, self.__y)[item]
 
@@ -69,6 +74,8 @@ class PositionSquare:
 
 
 class PositionHexagon:
+    __slots__ = ("__q", "__r", "__s")
+
     __q: int
     __r: int
     __s: int
@@ -94,6 +101,9 @@ class PositionHexagon:
     def __hash__(self) -> int:
         return hash((self.__q, self.__r, self.__s))
 
+    def __reduce__(self) -> tuple[type["PositionHexagon"], tuple[int, int, int]]:
+        return PositionHexagon, (self.__q, self.__r, self.__s)
+
     def __getitem__(self, item: int) -> int:
         return (self.__q, self.__r, self.__s)[item]
 
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from PyQt6.QtWidgets import QApplication
 
 from virtual_world.renderer.windows import MainWindow, WorldDialog
@@ -5,9 +7,9 @@ from virtual_world.world import World
 
 
 class Application:
-    def __init__(self) -> None:
+    def __init__(self, server_address: Optional[tuple[str, int]] = None) -> None:
         self._app = QApplication([])
-        self._window = MainWindow()
+        self._window = MainWindow(server_address=server_address)
 
     def run(self) -> None:
         self._window.show()
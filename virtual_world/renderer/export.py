@@ -0,0 +1,192 @@
+import os
+import queue
+import subprocess
+import threading
+from math import ceil
+from typing import Optional, Tuple
+
+from PyQt6.QtGui import QImage
+
+from virtual_world.config import Config
+from virtual_world.organisms.position import PositionSquare, PositionHexagon
+from virtual_world.world import World
+
+
+def encode_ppm(width: int, height: int, pixels: bytes | bytearray) -> bytes:
+    return b"P6\n%d %d\n255\n" % (width, height) + pixels
+
+
+class FrameRenderer:
+    __width: int
+    __height: int
+    __background: Tuple[int, int, int]
+
+    def __init__(
+        self,
+        width: int = Config.FRAME_WIDTH,
+        height: int = Config.FRAME_HEIGHT,
+        background: Tuple[int, int, int] = Config.FRAME_BACKGROUND_COLOR,
+    ) -> None:
+        self.__width = width
+        self.__height = height
+        self.__background = background
+
+    def get_width(self) -> int:
+        return self.__width
+
+    def get_height(self) -> int:
+        return self.__height
+
+    def render(self, world: World) -> bytearray:
+        with world.trace("render", "renderer"):
+            return self.__render(world)
+
+    def __render(self, world: World) -> bytearray:
+        first, size = self.__get_cell_bounds(world)
+        columns = min(size[0], self.__width)
+        rows = min(size[1], self.__height)
+        cells = bytearray(self.__background) * (columns * rows)
+        for entity in world.get_entities():
+            if not entity.is_alive():
+                continue
+            column, row = self.__get_cell(entity.get_position())
+            index = ((row - first[1]) * rows // size[1]) * columns + (
+                column - first[0]
+            ) * columns // size[0]
+            cells[index * 3 : index * 3 + 3] = bytes(entity.get_color())
+
+        repeats = [0] * columns
+        for x in range(self.__width):
+            repeats[x * columns // self.__width] += 1
+        frame = bytearray()
+        scaled_row = b""
+        previous_row = -1
+        for y in range(self.__height):
+            row = y * rows // self.__height
+            if row != previous_row:
+                source = cells[row * columns * 3 : (row + 1) * columns * 3]
+                if columns == self.__width:
+                    scaled_row = bytes(source)
+                else:
+                    scaled_row = b"".join(
+                        source[column * 3 : column * 3 + 3] * repeat
+                        for column, repeat in enumerate(repeats)
+                    )
+                previous_row = row
+            frame += scaled_row
+        return frame
+
+    @staticmethod
+    def __get_cell_bounds(world: World) -> tuple[tuple[int, int], tuple[int, int]]:
+        if world.get_type() == World.WorldType.SQUARE:
+            return (0, 0), (world.get_width(), world.get_height())
+        elif world.get_type() == World.WorldType.HEXAGONAL:
+            half_width = ceil(world.get_width() / 2)
+            half_height = ceil(world.get_height() / 2)
+            return (-half_width - half_height // 2 - 1, -half_height), (
+                2 * half_width + half_height + 2,
+                2 * half_height,
+            )
+        else:
+            raise ValueError("Invalid world type")
+
+    @staticmethod
+    def __get_cell(position: PositionSquare | PositionHexagon) -> tuple[int, int]:
+        if isinstance(position, PositionHexagon):
+            q, r = position.get_axial()
+            return q + (r - (r & 1)) // 2, r
+        return position.get_x(), position.get_y()
+
+
+class FrameExporter:
+    __renderer: FrameRenderer
+    __every: int
+    __directory: Optional[str]
+    __image_format: str
+    __process: Optional["subprocess.Popen[bytes]"]
+    __frames: "queue.Queue[Optional[tuple[int, bytearray]]]"
+    __thread: threading.Thread
+    __error: Optional[Exception] = None
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        command: Optional[list[str]] = None,
+        width: int = Config.FRAME_WIDTH,
+        height: int = Config.FRAME_HEIGHT,
+        every: int = Config.FRAME_EVERY,
+        image_format: str = "png",
+    ) -> None:
+        if directory is None and command is None:
+            raise ValueError("Frame export needs a directory or an encoder command")
+        if image_format not in ("png", "ppm"):
+            raise ValueError(f"Unknown image format: {image_format}")
+        self.__renderer = FrameRenderer(width, height)
+        self.__every = every
+        self.__directory = directory
+        self.__image_format = image_format
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.__process = None
+        if command is not None:
+            self.__process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        self.__frames = queue.Queue(Config.FRAME_QUEUE_SIZE)
+        # Encoding and writing happen on this thread so that they overlap
+        # with the next turns instead of being added to them.
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def __enter__(self) -> "FrameExporter":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def capture(self, world: World) -> bool:
+        if self.__error is not None:
+            raise self.__error
+        if world.get_turn() % self.__every:
+            return False
+        self.__frames.put((world.get_turn(), self.__renderer.render(world)))
+        return True
+
+    def close(self) -> None:
+        if self.__thread.is_alive():
+            self.__frames.put(None)
+            self.__thread.join()
+        if self.__process is not None:
+            assert self.__process.stdin is not None
+            self.__process.stdin.close()
+            self.__process.wait()
+            self.__process = None
+        if self.__error is not None:
+            raise self.__error
+
+    def __run(self) -> None:
+        while (frame := self.__frames.get()) is not None:
+            if self.__error is not None:
+                continue
+            try:
+                self.__write(*frame)
+            except OSError as error:
+                self.__error = error
+
+    def __write(self, turn: int, pixels: bytearray) -> None:
+        width = self.__renderer.get_width()
+        height = self.__renderer.get_height()
+        if self.__directory is not None:
+            path = os.path.join(
+                self.__directory, f"frame_{turn:06d}.{self.__image_format}"
+            )
+            if self.__image_format == "png":
+                image = QImage(
+                    bytes(pixels), width, height, width * 3, QImage.Format.Format_RGB888
+                )
+                if not image.save(path, "PNG"):
+                    raise OSError(f"Could not write frame to {path}")
+            else:
+                with open(path, "wb") as file:
+                    file.write(encode_ppm(width, height, pixels))
+        if self.__process is not None:
+            assert self.__process.stdin is not None
+            self.__process.stdin.write(encode_ppm(width, height, pixels))
@@ -0,0 +1,29 @@
+# mypy: ignore-errors
+from typing import Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QTcpSocket
+
+from virtual_world.client import WorldMirror
+from virtual_world.world import World
+
+
+class RemoteWorldConnection(QObject):  # type: ignore
+    world_changed = pyqtSignal(str)
+
+    def __init__(self, host: str, port: int, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._mirror = WorldMirror()
+        self._socket = QTcpSocket(self)
+        self._socket.readyRead.connect(self.__read)
+        self._socket.connectToHost(host, port)
+
+    def get_world(self) -> World:
+        return self._mirror.get_world()
+
+    def send(self, command: str, direction: Optional[str] = None) -> None:
+        self._socket.write(WorldMirror.encode_command(command, direction))
+
+    def __read(self) -> None:
+        for message_type in self._mirror.feed(bytes(self._socket.readAll())):
+            self.world_changed.emit(message_type)
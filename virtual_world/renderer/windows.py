@@ -1,10 +1,11 @@
 # mypy: ignore-errors
 import re
+from math import ceil, floor, sqrt
 from typing import Tuple, Optional
 
 from PyQt6 import QtGui, QtCore
-from PyQt6.QtCore import QRect, QPointF
-from PyQt6.QtGui import QPainter, QColor
+from PyQt6.QtCore import QRect, QRectF, QPointF, QLineF
+from PyQt6.QtGui import QPainter, QColor, QPixmap, QImage, QPolygonF, QPainterPath
 from PyQt6.QtWidgets import (
     QLabel,
     QWidget,
@@ -14,6 +15,9 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QComboBox,
     QPushButton,
+    QSizePolicy,
+    QCheckBox,
+    QScrollBar,
 )
 from PyQt6.QtWidgets import QDialog
 
@@ -22,24 +26,47 @@ import virtual_world.organisms.organism as organism_module
 import virtual_world.organisms.plants.plants as plants_module
 import virtual_world.world as world_module
 from virtual_world.config import Config
+from virtual_world.logs import LogEventType, RingBuffer
 from virtual_world.organisms.direction import DirectionSquare, DirectionHexagon
 from virtual_world.organisms.factory import OrganismFactory
 from virtual_world.organisms.position import PositionSquare, PositionHexagon
+from virtual_world.renderer.remote import RemoteWorldConnection
 
 
 class MainWindow(QWidget):  # type: ignore
     _world: Optional["world_module.World"] = None
+    _connection: Optional[RemoteWorldConnection] = None
+    _auto_play_timer: QtCore.QTimer
 
-    def __init__(self, parent: QWidget | None = None) -> None:
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        server_address: Optional[tuple[str, int]] = None,
+    ) -> None:
         super().__init__(parent)
         self.setWindowTitle("Virtual World - Jerzy Szyjut 193064")
-        WorldDialog(parent=self)
+        self._auto_play_timer = QtCore.QTimer(self)
+        self._auto_play_timer.setInterval(Config.AUTO_PLAY_INTERVAL)
+        self._auto_play_timer.timeout.connect(self.__go_to_next_turn)
+        if server_address is None:
+            WorldDialog(parent=self)
+        else:
+            self._connection = RemoteWorldConnection(*server_address, parent=self)
+            self._connection.world_changed.connect(self.__on_remote_world_changed)
         self.show()
         self.showMaximized()
 
+    def __on_remote_world_changed(self, message_type: str) -> None:
+        if self._world is None and message_type == "snapshot":
+            self.set_world(self._connection.get_world())
+            self.create_layout()
+        self.update()
+
     def create_layout(self) -> None:
         layout = QHBoxLayout()
-        layout.addWidget(WorldWidget(self._world))
+        layout.addWidget(
+            WorldWidget(self._world, read_only=self._connection is not None)
+        )
         side_layout = QVBoxLayout()
         legend_label = QLabel("Legend:")
         legend_label.setFixedHeight(50)
@@ -67,8 +94,19 @@ class MainWindow(QWidget):  # type: ignore
             self.__save()
         elif a0.key() == QtCore.Qt.Key.Key_L:
             self.__load()
+        elif a0.key() == QtCore.Qt.Key.Key_P:
+            self.__toggle_auto_play()
+
+    def __toggle_auto_play(self) -> None:
+        if self._auto_play_timer.isActive():
+            self._auto_play_timer.stop()
+        else:
+            self._auto_play_timer.start()
 
     def __go_to_next_turn(self) -> None:
+        if self._connection is not None:
+            self._connection.send("next_turn")
+            return
         if self._world.get_type() == self._world.WorldType.SQUARE:
             self._world.next_turn(DirectionSquare.NONE)
         elif self._world.get_type() == self._world.WorldType.HEXAGONAL:
@@ -78,6 +116,9 @@ class MainWindow(QWidget):  # type: ignore
         self.update()
 
     def __use_player_ability(self) -> None:
+        if self._connection is not None:
+            self._connection.send("ability")
+            return
         self._world.use_player_ability()
         self.update()
 
@@ -88,6 +129,9 @@ class MainWindow(QWidget):  # type: ignore
             direction = DirectionHexagon(key)  # type: ignore # assignment
         else:
             raise ValueError("Invalid world type")
+        if self._connection is not None:
+            self._connection.send("next_turn", direction.name)
+            return
         self._world.next_turn(direction)
         self.update()
 
@@ -99,6 +143,8 @@ class MainWindow(QWidget):  # type: ignore
             self._world.save(filename)
 
     def __load(self) -> None:
+        if self._connection is not None:
+            return
         filename = self.__get_load_file_name()
         if filename:
             self._world.load(filename)
@@ -138,34 +184,111 @@ class MainWindow(QWidget):  # type: ignore
 
 
 class LogsWidget(QWidget):  # type: ignore
+    line_height: int = 20
     _world: "world_module.World"
-    _last_turn: int
+    _read_count: int
+    _logs: RingBuffer[tuple[LogEventType, str]]
+    _visible_logs: RingBuffer[tuple[LogEventType, str]]
+    _event_types: set[LogEventType]
+    _scroll_bar: QScrollBar
 
     def __init__(
         self, world: "world_module.World", parent: QWidget | None = None
     ) -> None:
         super().__init__(parent)
-        layout = QHBoxLayout()
+        self._world = world
+        self._read_count = 0
+        self._logs = RingBuffer()
+        self._visible_logs = RingBuffer()
+        self._event_types = set(LogEventType)
+        layout = QVBoxLayout()
         self.setLayout(layout)
+        filters_layout = QHBoxLayout()
+        for event_type in LogEventType:
+            check_box = QCheckBox(event_type.name.capitalize())
+            check_box.setChecked(True)
+            check_box.toggled.connect(
+                lambda checked, event_type=event_type: self.set_event_type_visible(
+                    event_type, checked
+                )
+            )
+            filters_layout.addWidget(check_box)
+        layout.addLayout(filters_layout)
+        body_layout = QHBoxLayout()
+        body_layout.addStretch()
+        self._scroll_bar = QScrollBar(QtCore.Qt.Orientation.Vertical)
+        self._scroll_bar.setMaximum(0)
+        self._scroll_bar.valueChanged.connect(self.update)
+        body_layout.addWidget(self._scroll_bar)
+        layout.addLayout(body_layout, 1)
         self.setSizeIncrement(200, 200)
         self.show()
-        self._world = world
-        self._last_turn = world.get_turn()
+
+    def set_event_type_visible(self, event_type: LogEventType, visible: bool) -> None:
+        if visible:
+            self._event_types.add(event_type)
+        else:
+            self._event_types.discard(event_type)
+        self._visible_logs = RingBuffer(self._logs.get_capacity())
+        for log in self._logs:
+            if log[0] in self._event_types:
+                self._visible_logs.append(log)
+        self.__update_scroll_bar(True)
+        self.update()
+
+    def __read_world_logs(self) -> None:
+        logs = self._world.get_log_events_since(self._read_count)
+        self._read_count = self._world.get_log_count()
+        if not logs:
+            return
+        follow = self._scroll_bar.value() == self._scroll_bar.maximum()
+        for log in logs:
+            self._logs.append(log)
+            if log[0] in self._event_types:
+                self._visible_logs.append(log)
+        self.__update_scroll_bar(follow)
+
+    def __get_page_size(self) -> int:
+        return max(1, self._scroll_bar.height() // self.line_height)
+
+    def __update_scroll_bar(self, follow: bool) -> None:
+        page_size = self.__get_page_size()
+        self._scroll_bar.blockSignals(True)
+        self._scroll_bar.setPageStep(page_size)
+        self._scroll_bar.setMaximum(max(0, len(self._visible_logs) - page_size))
+        if follow:
+            self._scroll_bar.setValue(self._scroll_bar.maximum())
+        self._scroll_bar.blockSignals(False)
 
     def paintEvent(self, a0: QtGui.QPaintEvent) -> None:
+        self.__read_world_logs()
         painter = QPainter(self)
         painter.setPen(QColor(255, 255, 255))
         painter.setFont(QtGui.QFont("Arial", 10))
-        for i, log in enumerate(self._world.get_logs()):
-            painter.drawText(QPointF(0, i * 20 + 20), log)
-        if self._last_turn != self._world.get_turn():
-            self._last_turn = self._world.get_turn()
-            self._world.clear_logs()
+        top = self._scroll_bar.y()
+        first = self._scroll_bar.value()
+        last = min(len(self._visible_logs), first + self.__get_page_size())
+        for i in range(first, last):
+            painter.drawText(
+                QPointF(0, top + (i - first + 1) * self.line_height),
+                self._visible_logs[i][1],
+            )
+
+    def resizeEvent(self, a0: QtGui.QResizeEvent) -> None:
+        self.__update_scroll_bar(self._scroll_bar.value() == self._scroll_bar.maximum())
+
+    def wheelEvent(self, a0: QtGui.QWheelEvent) -> None:
+        self._scroll_bar.setValue(self._scroll_bar.value() - a0.angleDelta().y() // 40)
 
 
 class LegendWidget(QWidget):  # type: ignore
     unit_size: tuple[int, int] = (Config.BASE_FIELD_SIZE, Config.BASE_FIELD_SIZE)
     _world: "world_module.World"
+    _organisms: list[type["animals_module.Animal"] | type["plants_module.Plant"]]
+    _legend_pixmap: Optional[QPixmap] = None
+    _legend_key: Optional[tuple] = None
+    _status_pixmap: Optional[QPixmap] = None
+    _status: Optional[tuple] = None
 
     def __init__(
         self, world: "world_module.World", parent: QWidget | None = None
@@ -173,42 +296,98 @@ class LegendWidget(QWidget):  # type: ignore
         super().__init__(parent)
         layout = QHBoxLayout()
         self.setLayout(layout)
-        self.setFixedHeight(250)
         self._world = world
+        self._organisms = self.get_organisms()
+        self.setFixedHeight(
+            max(
+                len(self._organisms) * self.unit_size[1],
+                100 + len(self.get_possible_moves()) * 20,
+            )
+        )
         self.show()
 
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
-        for i, organism_class in enumerate(self.get_organisms()):
-            self._paint_organism(i, organism_class)
-        self._paint_possible_moves()
-        self.paint_current_turn()
-
-    def paint_current_turn(self) -> None:
+        legend_key = (self.width(), self.height(), self._world.get_type())
+        if legend_key != self._legend_key:
+            self._legend_pixmap = self.__render_legend()
+            self._legend_key = legend_key
+            self._status = None
+        status = self.__get_status()
+        if status != self._status:
+            self._status_pixmap = self.__render_status(status)
+            self._status = status
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._legend_pixmap)
+        painter.drawPixmap(0, 0, self._status_pixmap)
+
+    def __get_status(self) -> tuple:
+        player = self._world.get_player()
+        species_counts = self._world.get_species_counts()
+        return (
+            self._world.get_turn(),
+            player is not None and player.get_special_ability_cooldown(),
+            player is not None and player.get_special_ability_duration(),
+            player is not None and player.get_special_ability_active(),
+            tuple(
+                species_counts.get(organism_class.__name__, 0)
+                for organism_class in self._organisms
+            ),
+        )
+
+    def __create_pixmap(self) -> QPixmap:
+        pixmap = QPixmap(self.size())
+        pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+        return pixmap
+
+    def __render_legend(self) -> QPixmap:
+        pixmap = self.__create_pixmap()
+        painter = QPainter(pixmap)
+        painter.setFont(QtGui.QFont("Arial", 10))
+        for i, organism_class in enumerate(self._organisms):
+            painter.setBrush(QColor(*organism_class.get_species_color()))
+            painter.drawRect(
+                QRect(0, i * self.unit_size[1], self.unit_size[0], self.unit_size[1])
+            )
+            painter.drawText(
+                QPointF(self.unit_size[0] + 5, (i + 1) * self.unit_size[1] - 5),
+                self.pascal_case_to_normal_case(organism_class.__name__),
+            )
         painter.setPen(QColor(255, 255, 255))
+        for i, move in enumerate(self.get_possible_moves()):
+            painter.drawText(QPointF(240, i * 20 + 100), move)
+        painter.end()
+        return pixmap
+
+    def __render_status(self, status: tuple) -> QPixmap:
+        turn, cooldown, duration, active, counts = status
+        pixmap = self.__create_pixmap()
+        painter = QPainter(pixmap)
         painter.setFont(QtGui.QFont("Arial", 10))
-        painter.drawText(QPointF(100, 20), f"Current turn: {self._world.get_turn()}")
-        player = self._world.get_player()
-        painter.drawText(
-            QPointF(100, 40),
-            f"Current player ability cooldown: {player.get_special_ability_cooldown()}",
-        )  # type: ignore
-        painter.drawText(
-            QPointF(100, 60),
-            f"Current player ability duration: {player.get_special_ability_duration()}",
-        )  # type: ignore
-        painter.drawText(
-            QPointF(100, 80),
-            f"Current player ability active: {player.get_special_ability_active()}",
-        )  # type: ignore
-
-    def _paint_possible_moves(self) -> None:
+        for i, count in enumerate(counts):
+            painter.drawText(QPointF(185, (i + 1) * self.unit_size[1] - 5), str(count))
+        painter.setPen(QColor(255, 255, 255))
+        painter.drawText(QPointF(240, 20), f"Current turn: {turn}")
+        if self._world.get_player() is not None:
+            painter.drawText(
+                QPointF(240, 40), f"Current player ability cooldown: {cooldown}"
+            )
+            painter.drawText(
+                QPointF(240, 60), f"Current player ability duration: {duration}"
+            )
+            painter.drawText(
+                QPointF(240, 80), f"Current player ability active: {active}"
+            )
+        painter.end()
+        return pixmap
+
+    def get_possible_moves(self) -> list[str]:
         moves = [
             "ESC - exit",
             "ENTER - next turn",
             "SPACE - use player ability",
             "S - save game",
             "L - load game",
+            "P - toggle auto-play",
         ]
 
         if self._world.get_type() == world_module.World.WorldType.SQUARE:
@@ -229,29 +408,7 @@ class LegendWidget(QWidget):  # type: ignore
             ]
         else:
             raise ValueError("Invalid world type")
-
-        for i, move in enumerate(moves):
-            self._paint_move(i, move)
-
-    def _paint_move(self, i: int, move: str) -> None:
-        painter = QPainter(self)
-        painter.setPen(QColor(255, 255, 255))
-        painter.setFont(QtGui.QFont("Arial", 10))
-        painter.drawText(QPointF(200, i * 20 + 100), move)
-
-    def _paint_organism(
-        self, i: int, organism_class: type["organism_module.Organism"]
-    ) -> None:
-        organism_object = organism_class()
-        painter = QPainter(self)
-        painter.setBrush(QColor(*organism_object.get_color()))
-        painter.drawRect(
-            QRect(0, i * self.unit_size[1], self.unit_size[0], self.unit_size[1])
-        )
-        painter.drawText(
-            QPointF(self.unit_size[0] + 5, (i + 1) * self.unit_size[1] - 5),
-            self.pascal_case_to_normal_case(organism_object.__class__.__name__),
-        )
+        return moves
 
     @staticmethod
     def get_organisms() -> (
@@ -271,101 +428,554 @@ class LegendWidget(QWidget):  # type: ignore
 
 
 class WorldWidget(QWidget):  # type: ignore
-    unit_size: tuple[int, int] | tuple[int, int, int]
+    HEX_POLYGON: QPolygonF = QPolygonF(
+        [
+            QPointF(x, y)
+            for x, y in (
+                (0, -1),
+                (sqrt(3) / 2, -0.5),
+                (sqrt(3) / 2, 0.5),
+                (0, 1),
+                (-sqrt(3) / 2, 0.5),
+                (-sqrt(3) / 2, -0.5),
+                (0, -1),
+            )
+        ]
+    )
     _world: "world_module.World"
+    _read_only: bool
+    _zoom: float
+    _offset: QPointF
+    _interacted: bool = False
+    _drag_position: Optional[QPointF] = None
+    _view_key: Optional[tuple] = None
+    _grid_pixmap: Optional[QPixmap] = None
+    _colors: bytearray
+    _image: Optional[QImage] = None
+    _image_first: tuple[int, int] = (0, 0)
+    _image_size: tuple[int, int] = (0, 0)
+    _block: int = 1
+    _hex_template: Optional[QPolygonF] = None
+    _hex_template_zoom: float = 0.0
+    _hex_centres: dict[tuple[int, int], QPointF]
+    _hex_paths_zoom: float = 0.0
+    _species_paths: dict[tuple[int, int], dict[Tuple[int, int, int], QPainterPath]]
 
     def __init__(
-        self, world: "world_module.World", parent: QWidget | None = None
+        self,
+        world: "world_module.World",
+        parent: QWidget | None = None,
+        read_only: bool = False,
     ) -> None:
         super().__init__(parent)
+        self._read_only = read_only
         layout = QHBoxLayout()
         self.setLayout(layout)
-        self.setSizeIncrement(500, 500)
-        self.setFixedWidth(510)
-        self.setFixedHeight(510)
+        self.setMinimumSize(510, 510)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self._world = world
-        self.unit_size = self.__get_unit_size(world.get_width(), world.get_height())
+        self._hex_centres = {}
+        self._species_paths = {}
+        self.fit_world()
         self.show()
 
-    def __get_unit_size(self, world_width: int, world_height: int) -> tuple[int, int]:
+    def fit_world(self) -> None:
+        bounds = self.__get_world_bounds()
+        zoom = min(self.width() / bounds.width(), self.height() / bounds.height())
+        self._zoom = float(floor(zoom)) if zoom >= 1 else zoom
+        self._offset = bounds.topLeft()
+        self.update()
+
+    def __get_world_bounds(self) -> QRectF:
         if self._world.get_type() == world_module.World.WorldType.SQUARE:
-            return (self.width() - 10) // world_width, (
-                self.height() - 10
-            ) // world_height
+            return QRectF(0, 0, self._world.get_width(), self._world.get_height())
         elif self._world.get_type() == world_module.World.WorldType.HEXAGONAL:
-            return (
-                (self.width() - 10) // (world_width + 1),
-                (self.height() - 10) // (world_height + 1),
+            half_width = ceil(self._world.get_width() / 2)
+            half_height = ceil(self._world.get_height() / 2)
+            return QRectF(
+                -sqrt(3) * half_width,
+                -1.5 * half_height - 1,
+                sqrt(3) * 2 * half_width,
+                1.5 * (2 * half_height - 1) + 2,
             )
         else:
             raise ValueError("Invalid world type")
 
+    def zoom_at(self, point: QPointF, factor: float) -> None:
+        cell = self._offset + point / self._zoom
+        self._zoom = min(
+            max(self._zoom * factor, Config.MIN_ZOOM_CELL_SIZE),
+            Config.MAX_ZOOM_CELL_SIZE,
+        )
+        self._offset = cell - point / self._zoom
+        self._interacted = True
+        self.update()
+
+    def pan(self, delta: QPointF) -> None:
+        self._offset -= delta / self._zoom
+        self._interacted = True
+        self.update()
+
+    def get_visible_range(self) -> tuple[tuple[int, int], tuple[int, int]]:
+        if self._world.get_type() == world_module.World.WorldType.HEXAGONAL:
+            return self.__get_visible_hex_range()
+        return (
+            (max(0, floor(self._offset.x())), max(0, floor(self._offset.y()))),
+            (
+                min(
+                    self._world.get_width() - 1,
+                    ceil(self._offset.x() + self.width() / self._zoom) - 1,
+                ),
+                min(
+                    self._world.get_height() - 1,
+                    ceil(self._offset.y() + self.height() / self._zoom) - 1,
+                ),
+            ),
+        )
+
+    def __get_visible_hex_range(self) -> tuple[tuple[int, int], tuple[int, int]]:
+        half_width = ceil(self._world.get_width() / 2)
+        half_height = ceil(self._world.get_height() / 2)
+        first_row = max(-half_height, floor(self._offset.y() / 1.5) - 1)
+        last_row = min(
+            half_height - 1,
+            ceil((self._offset.y() + self.height() / self._zoom) / 1.5) + 1,
+        )
+        return (
+            (
+                max(
+                    -half_width - half_height,
+                    floor(self._offset.x() / sqrt(3) - last_row / 2) - 1,
+                ),
+                first_row,
+            ),
+            (
+                min(
+                    half_width + half_height,
+                    ceil(
+                        (self._offset.x() + self.width() / self._zoom) / sqrt(3)
+                        - first_row / 2
+                    )
+                    + 1,
+                ),
+                last_row,
+            ),
+        )
+
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
-        for organism_object in self._world.get_entities():
-            self.__paint_organism(organism_object)
-        self.paint_field_borders()
+        with self._world.trace("paint", "renderer"):
+            self.__paint()
 
-    def paint_field_borders(self) -> None:
+    def __paint(self) -> None:
+        dirty_positions = self._world.take_dirty_positions()
+        view_key = self.__get_view_key()
+        if view_key != self._view_key or dirty_positions is None:
+            if dirty_positions is None:
+                # The world was replaced, so no cached path can be trusted.
+                self._species_paths = {}
+            self.__render_view()
+            self._view_key = view_key
+        elif dirty_positions and (
+            self._world.get_type() == world_module.World.WorldType.HEXAGONAL
+        ):
+            self.__render_hex_chunks(dirty_positions)
+        elif dirty_positions and self._block == 1:
+            self.__render_cells(dirty_positions)
+        elif dirty_positions and self._block < self._world.get_chunk_size():
+            # When a turn touched more cells than a full render visits tiles,
+            # one pass over the visible tiles is cheaper than block by block.
+            if len(dirty_positions) < min(
+                self._image_size[0] * self._image_size[1],
+                sum(self._world.get_species_counts().values()),
+            ):
+                self.__render_blocks(dirty_positions)
+            else:
+                self.__render_view()
+        elif dirty_positions:
+            self.__render_view()
         painter = QPainter(self)
+        if self._species_paths:
+            painter.save()
+            painter.scale(self._zoom, self._zoom)
+            painter.translate(-self._offset.x(), -self._offset.y())
+            for paths in self._species_paths.values():
+                for color, path in paths.items():
+                    painter.fillPath(path, QColor(*color))
+            painter.restore()
+        if self._image is not None:
+            painter.drawImage(
+                QRectF(
+                    (self._image_first[0] - self._offset.x()) * self._zoom,
+                    (self._image_first[1] - self._offset.y()) * self._zoom,
+                    self._image_size[0] * self._block * self._zoom,
+                    self._image_size[1] * self._block * self._zoom,
+                ),
+                self._image,
+            )
+        if self._grid_pixmap is not None:
+            painter.drawPixmap(0, 0, self._grid_pixmap)
+
+    def resizeEvent(self, a0: QtGui.QResizeEvent) -> None:
+        if not self._interacted:
+            self.fit_world()
+
+    def __get_view_key(self) -> tuple:
+        return (
+            self.width(),
+            self.height(),
+            self._zoom,
+            self._offset.x(),
+            self._offset.y(),
+            self._world.get_width(),
+            self._world.get_height(),
+            self._world.get_type(),
+        )
+
+    def __get_background(self) -> Tuple[int, int, int]:
+        background = self.palette().color(self.backgroundRole())
+        return background.red(), background.green(), background.blue()
+
+    def __render_view(self) -> None:
+        first, last = self.get_visible_range()
+        self.__render_grid(first, last)
+        self._image = None
+        if self._world.get_type() == world_module.World.WorldType.HEXAGONAL:
+            self.__render_hex_organisms(first, last)
+            return
+        self._species_paths = {}
+        if last[0] < first[0] or last[1] < first[1]:
+            return
+
+        block = max(1, ceil(1 / self._zoom))
+        if 1 < block < self._world.get_chunk_size():
+            # Blocks are made of whole species tiles, so they can be coloured
+            # from the counts the grid keeps instead of from every organism.
+            tile_size = self._world.get_species_tile_size()
+            block = ceil(block / tile_size) * tile_size
+        first = (first[0] // block * block, first[1] // block * block)
+        columns = (last[0] - first[0]) // block + 1
+        rows = (last[1] - first[1]) // block + 1
+        self._block = block
+        self._image_first = first
+        self._image_size = (columns, rows)
+        self._colors = bytearray(self.__get_background()) * (columns * rows)
+        if block == 1:
+            for organism_object in self._world.get_entities_in_area(first, last):
+                self.__paint_organism(organism_object)
+        elif block < self._world.get_chunk_size():
+            self.__render_dominant_species(first, last)
+        else:
+            self.__render_density(first, last)
+        self._image = QImage(
+            self._colors, columns, rows, columns * 3, QImage.Format.Format_RGB888
+        )
+
+    def __render_hex_organisms(
+        self, first: tuple[int, int], last: tuple[int, int]
+    ) -> None:
+        # Paths are kept per chunk in world coordinates, so panning and
+        # zooming reuse them and a turn only rebuilds the chunks it changed.
+        # Below a zoom of 1 organisms are single pixels, sized by the zoom.
+        if (
+            self._zoom != self._hex_paths_zoom
+            and min(self._zoom, self._hex_paths_zoom) < 1
+        ):
+            self._species_paths = {}
+        self._hex_paths_zoom = self._zoom
+        chunks = self.__get_visible_hex_chunks(first, last)
+        self._species_paths = {
+            chunk: paths
+            for chunk, paths in self._species_paths.items()
+            if chunk in chunks
+        }
+        for chunk in chunks - self._species_paths.keys():
+            self.__render_hex_chunk(chunk)
+
+    def __render_hex_chunks(
+        self, positions: set[PositionSquare | PositionHexagon]
+    ) -> None:
+        chunks = self.__get_visible_hex_chunks(*self.get_visible_range())
+        chunk_size = self._world.get_chunk_size()
+        for position in positions:
+            if isinstance(position, PositionHexagon):
+                q, r = position.get_axial()
+                chunk = (q // chunk_size, r // chunk_size)
+                if chunk in chunks:
+                    chunks.discard(chunk)
+                    self.__render_hex_chunk(chunk)
+
+    def __get_visible_hex_chunks(
+        self, first: tuple[int, int], last: tuple[int, int]
+    ) -> set[tuple[int, int]]:
+        chunk_size = self._world.get_chunk_size()
+        return {
+            (chunk_q, chunk_r)
+            for chunk_q in range(first[0] // chunk_size, last[0] // chunk_size + 1)
+            for chunk_r in range(first[1] // chunk_size, last[1] // chunk_size + 1)
+        }
+
+    def __render_hex_chunk(self, chunk: tuple[int, int]) -> None:
+        chunk_size = self._world.get_chunk_size()
+        paths: dict[Tuple[int, int, int], QPainterPath] = {}
+        for organism_object in self._world.get_entities_in_area(
+            (chunk[0] * chunk_size, chunk[1] * chunk_size),
+            ((chunk[0] + 1) * chunk_size - 1, (chunk[1] + 1) * chunk_size - 1),
+        ):
+            color = organism_object.get_color()
+            path = paths.get(color)
+            if path is None:
+                path = paths[color] = QPainterPath()
+            q, r = organism_object.get_position().get_axial()
+            centre = self._hex_centres.get((q, r))
+            if centre is None:
+                centre = self._hex_centres[(q, r)] = QPointF(
+                    sqrt(3) * (q + r / 2), 1.5 * r
+                )
+            if self._zoom < 1:
+                path.addRect(
+                    QRectF(centre.x(), centre.y(), 1 / self._zoom, 1 / self._zoom)
+                )
+            else:
+                path.addPolygon(WorldWidget.HEX_POLYGON.translated(centre))
+        if paths:
+            self._species_paths[chunk] = paths
+        else:
+            self._species_paths.pop(chunk, None)
+
+    def __get_hex_template(self) -> QPolygonF:
+        if self._hex_template is None or self._hex_template_zoom != self._zoom:
+            self._hex_template = QPolygonF(
+                [
+                    QPointF(point.x() * self._zoom, point.y() * self._zoom)
+                    for point in WorldWidget.HEX_POLYGON
+                ]
+            )
+            self._hex_template_zoom = self._zoom
+        return self._hex_template
+
+    def __get_hex_centre(self, q: int, r: int) -> QPointF:
+        return QPointF(
+            (sqrt(3) * (q + r / 2) - self._offset.x()) * self._zoom,
+            (1.5 * r - self._offset.y()) * self._zoom,
+        )
+
+    def __render_dominant_species(
+        self, first: tuple[int, int], last: tuple[int, int]
+    ) -> None:
+        tiles_per_block = self._block // self._world.get_species_tile_size()
+        first_block = (first[0] // self._block, first[1] // self._block)
+        blocks: dict[int, dict[type["organism_module.Organism"], int]] = {}
+        for tile_key, tile_counts in self._world.get_species_tiles(first, last):
+            index = (
+                tile_key[1] // tiles_per_block - first_block[1]
+            ) * self._image_size[0] + (tile_key[0] // tiles_per_block - first_block[0])
+            counts = blocks.setdefault(index, {})
+            for species, count in tile_counts.items():
+                counts[species] = counts.get(species, 0) + count
+        for index, counts in blocks.items():
+            self.__set_pixel(index, self.__get_dominant_color(counts))
+
+    def __render_blocks(self, positions: set[PositionSquare | PositionHexagon]) -> None:
+        if self._image is None:
+            return
+        columns, rows = self._image_size
+        blocks = set()
+        for position in positions:
+            if isinstance(position, PositionSquare):
+                column = (position.get_x() - self._image_first[0]) // self._block
+                row = (position.get_y() - self._image_first[1]) // self._block
+                if 0 <= column < columns and 0 <= row < rows:
+                    blocks.add((column, row))
+        tile_size = self._world.get_species_tile_size()
+        tiles_per_block = self._block // tile_size
+        background = self.__get_background()
+        for column, row in blocks:
+            first_tile = (
+                (self._image_first[0] + column * self._block) // tile_size,
+                (self._image_first[1] + row * self._block) // tile_size,
+            )
+            counts: dict[type["organism_module.Organism"], int] = {}
+            for tile_x in range(first_tile[0], first_tile[0] + tiles_per_block):
+                for tile_y in range(first_tile[1], first_tile[1] + tiles_per_block):
+                    tile_counts = self._world.get_tile_species((tile_x, tile_y))
+                    for species, count in tile_counts.items():
+                        counts[species] = counts.get(species, 0) + count
+            self.__set_pixel(
+                row * columns + column,
+                self.__get_dominant_color(counts) if counts else background,
+            )
+
+    @staticmethod
+    def __get_dominant_color(
+        counts: dict[type["organism_module.Organism"], int],
+    ) -> Tuple[int, int, int]:
+        # Ties go to the same species however the counts were gathered, so a
+        # repainted block matches a full render.
+        return max(
+            (count, species.get_species_color()) for species, count in counts.items()
+        )[1]
+
+    def __render_density(self, first: tuple[int, int], last: tuple[int, int]) -> None:
+        chunk_size = self._world.get_chunk_size()
+        populations: dict[int, int] = {}
+        for chunk, population in self._world.get_chunk_populations().items():
+            position = PositionSquare(
+                max(chunk[0] * chunk_size, first[0]),
+                max(chunk[1] * chunk_size, first[1]),
+            )
+            if position.get_x() > last[0] or position.get_y() > last[1]:
+                continue
+            index = self.__get_pixel_index(position)
+            populations[index] = populations.get(index, 0) + population
+        if not populations:
+            return
+        background = self.__get_background()
+        highest_population = max(populations.values())
+        for index, population in populations.items():
+            density = population / highest_population
+            self.__set_pixel(
+                index,
+                tuple(
+                    round(base + (target - base) * density)
+                    for base, target in zip(background, Config.DENSITY_COLOR)
+                ),
+            )
+
+    def __render_cells(self, positions: set[PositionSquare | PositionHexagon]) -> None:
+        if self._image is None:
+            return
+        background = self.__get_background()
+        for position in positions:
+            if not isinstance(position, PositionSquare) or not self.__is_in_image(
+                position
+            ):
+                continue
+            organism_object = self._world.get_entity(position)
+            if organism_object is not None:
+                self.__paint_organism(organism_object)
+            else:
+                self.__set_pixel(self.__get_pixel_index(position), background)
+
+    def __render_grid(self, first: tuple[int, int], last: tuple[int, int]) -> None:
+        self._grid_pixmap = None
+        if self._zoom < Config.GRID_MIN_CELL_SIZE:
+            return
+        self._grid_pixmap = QPixmap(self.size())
+        self._grid_pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+        painter = QPainter(self._grid_pixmap)
+        self.paint_field_borders(painter, first, last)
+        painter.end()
+
+    def paint_field_borders(
+        self, painter: QPainter, first: tuple[int, int], last: tuple[int, int]
+    ) -> None:
         if self._world.get_type() == world_module.World.WorldType.SQUARE:
-            for i in range(0, self._world.get_width()):
-                for j in range(0, self._world.get_height()):
-                    rectangle = QRect(
-                        i * self.unit_size[0],
-                        j * self.unit_size[1],
-                        self.unit_size[0],
-                        self.unit_size[1],
-                    )
-                    painter.drawRect(rectangle)
+            top = (first[1] - self._offset.y()) * self._zoom
+            bottom = (last[1] + 1 - self._offset.y()) * self._zoom
+            for i in range(first[0], last[0] + 2):
+                x = (i - self._offset.x()) * self._zoom
+                painter.drawLine(QLineF(x, top, x, bottom))
+            left = (first[0] - self._offset.x()) * self._zoom
+            right = (last[0] + 1 - self._offset.x()) * self._zoom
+            for j in range(first[1], last[1] + 2):
+                y = (j - self._offset.y()) * self._zoom
+                painter.drawLine(QLineF(left, y, right, y))
         elif self._world.get_type() == world_module.World.WorldType.HEXAGONAL:
-            for i in range(0, self._world.get_width()):
-                for j in range(0, self._world.get_height()):
-                    if i % 2 == 0:
-                        rectangle = QRect(
-                            i * self.unit_size[0],
-                            j * self.unit_size[1],
-                            self.unit_size[0],
-                            self.unit_size[1],
+            template = self.__get_hex_template()
+            path = QPainterPath()
+            left = self._offset.x() / sqrt(3)
+            right = (self._offset.x() + self.width() / self._zoom) / sqrt(3)
+            for r in range(first[1], last[1] + 1):
+                for q in range(
+                    max(first[0], floor(left - r / 2) - 1),
+                    min(last[0], ceil(right - r / 2) + 1) + 1,
+                ):
+                    if self._world.is_position_in_world(PositionHexagon(q, r, -q - r)):
+                        path.addPolygon(
+                            template.translated(self.__get_hex_centre(q, r))
                         )
-                        painter.drawRect(rectangle)
-                    else:
-                        rectangle = QRect(
-                            i * self.unit_size[0],
-                            j * self.unit_size[1] + self.unit_size[1] // 2,
-                            self.unit_size[0],
-                            self.unit_size[1],
-                        )
-                        painter.drawRect(rectangle)
+            painter.drawPath(path)
 
     def __paint_organism(self, organism_object: "organism_module.Organism") -> None:
-        painter = QPainter(self)
         position = organism_object.get_position()
-        if isinstance(position, PositionSquare):
-            rectangle = QRect(
-                position.get_x() * self.unit_size[0],
-                position.get_y() * self.unit_size[1],
-                self.unit_size[0],
-                self.unit_size[1],
+        if isinstance(position, PositionSquare) and self.__is_in_image(position):
+            self.__set_pixel(
+                self.__get_pixel_index(position), organism_object.get_color()
             )
-            painter.fillRect(rectangle, QColor(*organism_object.get_color()))
+
+    def __is_in_image(self, position: PositionSquare) -> bool:
+        return (
+            0
+            <= position.get_x() - self._image_first[0]
+            < self._image_size[0] * self._block
+            and 0
+            <= position.get_y() - self._image_first[1]
+            < self._image_size[1] * self._block
+        )
+
+    def __get_pixel_index(self, position: PositionSquare) -> int:
+        return (
+            (position.get_y() - self._image_first[1]) // self._block
+        ) * self._image_size[0] + (
+            position.get_x() - self._image_first[0]
+        ) // self._block
+
+    def __set_pixel(self, index: int, color: Tuple[int, int, int]) -> None:
+        self._colors[index * 3 : index * 3 + 3] = bytes(color)
 
     def mousePressEvent(self, a0: QtGui.QMouseEvent) -> None:
-        position = self.__get_position_from_mouse_position((a0.pos().x(), a0.pos().y()))
+        if a0.button() in (
+            QtCore.Qt.MouseButton.RightButton,
+            QtCore.Qt.MouseButton.MiddleButton,
+        ):
+            self._drag_position = a0.position()
+            return
+        if self._read_only:
+            return
+        position = self.__get_position_from_mouse_position(a0.position())
         if position is not None:
             self.__open_organism_choice_dialog(position)
 
+    def mouseMoveEvent(self, a0: QtGui.QMouseEvent) -> None:
+        if self._drag_position is not None:
+            self.pan(a0.position() - self._drag_position)
+            self._drag_position = a0.position()
+
+    def mouseReleaseEvent(self, a0: QtGui.QMouseEvent) -> None:
+        self._drag_position = None
+
+    def wheelEvent(self, a0: QtGui.QWheelEvent) -> None:
+        self.zoom_at(a0.position(), Config.ZOOM_STEP ** (a0.angleDelta().y() / 120))
+
     def __get_position_from_mouse_position(
-        self, mouse_position: tuple[int, int]
-    ) -> PositionSquare | PositionHexagon:
+        self, mouse_position: QPointF
+    ) -> Optional[PositionSquare | PositionHexagon]:
         if self._world.get_type() == world_module.World.WorldType.SQUARE:
             position = PositionSquare(
-                mouse_position[0] // self.unit_size[0],
-                mouse_position[1] // self.unit_size[1],
+                floor(self._offset.x() + mouse_position.x() / self._zoom),
+                floor(self._offset.y() + mouse_position.y() / self._zoom),
             )
-            if self._world.is_position_in_world(position):
-                return position
+        elif self._world.get_type() == world_module.World.WorldType.HEXAGONAL:
+            x = self._offset.x() + mouse_position.x() / self._zoom
+            y = self._offset.y() + mouse_position.y() / self._zoom
+            fractional_q = x / sqrt(3) - y / 3
+            fractional_r = y / 1.5
+            fractional_s = -fractional_q - fractional_r
+            q, r, s = round(fractional_q), round(fractional_r), round(fractional_s)
+            q_error = abs(q - fractional_q)
+            r_error = abs(r - fractional_r)
+            s_error = abs(s - fractional_s)
+            if q_error > r_error and q_error > s_error:
+                q = -r - s
+            elif r_error > s_error:
+                r = -q - s
+            else:
+                s = -q - r
+            position = PositionHexagon(q, r, s)
         else:
-            raise NotImplementedError
+            raise ValueError("Invalid world type")
+        if self._world.is_position_in_world(position):
+            return position
 
     def __open_organism_choice_dialog(
         self, position: PositionSquare | PositionHexagon
@@ -390,7 +1000,7 @@ class WorldDialog(QDialog):  # type: ignore
         self.world_height = QLineEdit()
         self.world_height.setPlaceholderText("World height")
         self.world_type = QComboBox()
-        self.world_type.addItems(["Square"])
+        self.world_type.addItems(["Square", "Hexagonal"])
         self.submit_button = QPushButton("Submit")
         self.submit_button.clicked.connect(self.submit)
         self.layout.addWidget(self.world_width)
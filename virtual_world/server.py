@@ -0,0 +1,189 @@
+import asyncio
+import json
+from typing import Any, Optional
+
+from virtual_world.config import Config
+from virtual_world.diff import TurnDiff
+from virtual_world.organisms.direction import DirectionSquare, DirectionHexagon
+from virtual_world.world import World
+
+
+class SimulationServer:
+    __world: World
+    __log_count: int
+    __host: str
+    __port: int
+    __turn_interval: Optional[float]
+    __clients: dict[asyncio.StreamWriter, "asyncio.Queue[bytes]"]
+    __lock: asyncio.Lock
+
+    def __init__(
+        self,
+        world: World,
+        host: str = Config.SERVER_HOST,
+        port: int = Config.SERVER_PORT,
+        turn_interval: Optional[float] = None,
+    ) -> None:
+        self.__world = world
+        self.__world.set_recording_diffs(True)
+        self.__log_count = world.get_log_count()
+        self.__host = host
+        self.__port = port
+        self.__turn_interval = turn_interval
+        self.__clients = {}
+        self.__lock = asyncio.Lock()
+
+    def run(self) -> None:
+        asyncio.run(self.serve_forever())
+
+    async def serve_forever(self) -> None:
+        server = await asyncio.start_server(
+            self.__handle_client, self.__host, self.__port
+        )
+        async with server:
+            tick = None
+            if self.__turn_interval is not None:
+                tick = asyncio.create_task(self.__tick())
+            try:
+                await server.serve_forever()
+            finally:
+                if tick is not None:
+                    tick.cancel()
+
+    async def next_turn(
+        self, direction: DirectionSquare | DirectionHexagon | None = None
+    ) -> None:
+        async with self.__lock:
+            if direction is None:
+                direction = self.__get_none_direction()
+            self.__broadcast_diff(self.__world.next_turn(direction))
+
+    async def use_player_ability(self) -> None:
+        async with self.__lock:
+            self.__world.use_player_ability()
+            self.__broadcast_diff(self.__world.take_diff())
+
+    async def __tick(self) -> None:
+        assert self.__turn_interval is not None
+        while True:
+            await asyncio.sleep(self.__turn_interval)
+            await self.next_turn()
+
+    async def __handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # Every client is written to by its own task, so a slow viewer only
+        # fills its own queue instead of holding up the turns.
+        messages: "asyncio.Queue[bytes]" = asyncio.Queue(Config.SERVER_QUEUE_SIZE)
+        sender = asyncio.create_task(self.__send_messages(writer, messages))
+        async with self.__lock:
+            self.__broadcast_diff(self.__world.take_diff(), skip_empty=True)
+            self.__clients[writer] = messages
+            self.__send(writer, self.__snapshot_message())
+        try:
+            while line := await reader.readline():
+                try:
+                    await self.__handle_command(writer, json.loads(line))
+                except (ValueError, KeyError) as error:
+                    self.__send(writer, {"type": "error", "message": str(error)})
+        except ConnectionError:
+            pass
+        finally:
+            self.__clients.pop(writer, None)
+            sender.cancel()
+            writer.close()
+
+    async def __handle_command(
+        self, writer: asyncio.StreamWriter, message: dict[str, Any]
+    ) -> None:
+        command = message.get("command")
+        if command == "next_turn":
+            await self.next_turn(self.get_direction(message.get("direction")))
+        elif command == "ability":
+            await self.use_player_ability()
+        elif command == "snapshot":
+            async with self.__lock:
+                self.__broadcast_diff(self.__world.take_diff(), skip_empty=True)
+                self.__send(writer, self.__snapshot_message())
+        else:
+            raise ValueError(f"Unknown command: {command}")
+
+    def get_direction(
+        self, name: Optional[str]
+    ) -> DirectionSquare | DirectionHexagon | None:
+        if name is None:
+            return None
+        if self.__world.get_type() == World.WorldType.SQUARE:
+            return DirectionSquare[name]
+        elif self.__world.get_type() == World.WorldType.HEXAGONAL:
+            return DirectionHexagon[name]
+        else:
+            raise ValueError("Invalid world type")
+
+    def __get_none_direction(self) -> DirectionSquare | DirectionHexagon:
+        if self.__world.get_type() == World.WorldType.SQUARE:
+            return DirectionSquare.NONE
+        elif self.__world.get_type() == World.WorldType.HEXAGONAL:
+            return DirectionHexagon.NONE
+        else:
+            raise ValueError("Invalid world type")
+
+    def __snapshot_message(self) -> dict[str, Any]:
+        data = self.__world.__dict__()
+        # The mirror never runs a turn, and its entities are listed below.
+        data.pop("schedule", None)
+        data.pop("schedule_start", None)
+        player = self.__world.get_player()
+        if data["player"] is not None and player is not None:
+            data["player"]["id"] = player.get_id()
+        data["entities"] = [
+            {**entity.__dict__(), "id": entity.get_id()}
+            for entity in sorted(
+                self.__world.get_entities(), key=lambda entity: entity.get_sequence()
+            )
+            if entity.is_alive() and entity is not player
+        ]
+        return {"type": "snapshot", "world": data}
+
+    def __broadcast_diff(
+        self, diff: Optional[TurnDiff], skip_empty: bool = False
+    ) -> None:
+        assert diff is not None
+        logs = [
+            {"type": event_type.name, "message": log}
+            for event_type, log in self.__world.get_log_events_since(self.__log_count)
+        ]
+        self.__log_count = self.__world.get_log_count()
+        if diff.is_reset():
+            message = self.__snapshot_message()
+        elif skip_empty and diff.is_empty() and not logs:
+            return
+        else:
+            message = {"type": "diff", "diff": {**diff.__dict__(), "logs": logs}}
+        for writer in list(self.__clients):
+            self.__send(writer, message)
+
+    def __send(self, writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+        messages = self.__clients.get(writer)
+        if messages is None:
+            return
+        try:
+            messages.put_nowait(
+                json.dumps(message, separators=(",", ":")).encode() + b"\n"
+            )
+        except asyncio.QueueFull:
+            # A client that cannot keep up is dropped, it gets a fresh
+            # snapshot when it connects again.
+            self.__clients.pop(writer)
+            writer.close()
+
+    @staticmethod
+    async def __send_messages(
+        writer: asyncio.StreamWriter, messages: "asyncio.Queue[bytes]"
+    ) -> None:
+        try:
+            while True:
+                writer.write(await messages.get())
+                await writer.drain()
+        except ConnectionError:
+            writer.close()
@@ -0,0 +1,334 @@
+import multiprocessing
+import random
+from collections import deque
+from math import ceil
+from multiprocessing.connection import Connection
+from typing import Any, Optional
+
+from virtual_world.config import Config
+from virtual_world.logs import LogEventType
+from virtual_world.organisms.animals.animals import Human
+from virtual_world.organisms.direction import DirectionSquare, DirectionHexagon
+from virtual_world.organisms.factory import OrganismFactory
+from virtual_world.organisms.organism import Organism
+from virtual_world.organisms.position import PositionSquare, PositionHexagon
+from virtual_world.world import World
+
+
+def create_organism(data: dict[str, Any]) -> Organism:
+    if data["type"] == "Human":
+        human = Human()
+        human.set_from_dict(data)  # type: ignore # arg-type
+        return human
+    return OrganismFactory.create(data)  # type: ignore # arg-type
+
+
+class ShardWorker:
+    __connection: Connection
+    __first_row: int
+    __last_row: int
+    __world: World
+    __ghosts: dict[Organism, tuple[int, int]]
+
+    def __init__(
+        self,
+        connection: Connection,
+        first_row: int,
+        last_row: int,
+        data: dict[str, Any],
+        seed: Optional[int],
+    ) -> None:
+        random.seed(seed)
+        self.__connection = connection
+        self.__first_row = first_row
+        self.__last_row = last_row
+        self.__world = World(data["width"], data["height"])
+        self.__world.set_from_dict(data)
+        self.__world.set_seed(seed)
+        self.__ghosts = {}
+
+    def run(self) -> None:
+        while True:
+            message = self.__connection.recv()
+            if message[0] == "halo":
+                self.__connection.send(self.__export_halo())
+            elif message[0] == "turn":
+                self.__connection.send(self.__next_turn(message[1], message[2]))
+            elif message[0] == "settle":
+                self.__connection.send(self.__settle(message[1], message[2]))
+            elif message[0] == "gather":
+                self.__connection.send(self.__world.__dict__())
+            elif message[0] == "stop":
+                break
+            else:
+                raise ValueError(f"Unknown shard command: {message[0]}")
+
+    def __export_halo(self) -> dict[str, list[tuple[int, dict[str, Any]]]]:
+        last_column = self.__world.get_width() - 1
+        halo_rows = Config.SHARD_HALO_ROWS
+        return {
+            "up": self.__export_area(
+                (0, self.__first_row), (last_column, self.__first_row + halo_rows - 1)
+            ),
+            "down": self.__export_area(
+                (0, self.__last_row - halo_rows), (last_column, self.__last_row - 1)
+            ),
+        }
+
+    def __export_area(
+        self, first: tuple[int, int], last: tuple[int, int]
+    ) -> list[tuple[int, dict[str, Any]]]:
+        exported = []
+        for entity in self.__world.get_entities_in_area(first, last):
+            if entity.is_alive():
+                # Store ids carry a generation, so a kill reported for an
+                # organism that has since left the store finds nothing.
+                entity_id = entity.get_id()
+                assert entity_id is not None
+                exported.append((entity_id, dict(entity.__dict__())))
+        return exported
+
+    def __next_turn(
+        self,
+        direction: DirectionSquare | DirectionHexagon,
+        ghosts: list[tuple[int, int, dict[str, Any]]],
+    ) -> dict[str, Any]:
+        self.__ghosts = {}
+        for owner, owner_id, data in ghosts:
+            ghost = create_organism(data)
+            self.__world.add_halo_entity(ghost)
+            self.__ghosts[ghost] = (owner, owner_id)
+
+        self.__world.next_turn(direction)
+
+        kills = []
+        for ghost, (owner, owner_id) in self.__ghosts.items():
+            if not ghost.is_alive():
+                kills.append((owner, owner_id))
+            self.__world.remove_halo_entity(ghost)
+        self.__ghosts = {}
+
+        migrants = []
+        leaving = [
+            entity
+            for entity in self.__world.get_entities()
+            if not self.__is_in_band(entity.get_position()[1])
+        ]
+        for entity in sorted(leaving, key=lambda entity: entity.get_sequence()):
+            migrants.append(dict(entity.__dict__()))
+            self.__world.remove_entity(entity)
+            if entity is self.__world.get_player():
+                self.__world.set_player(None)
+
+        logs = self.__world.get_logs().copy()
+        self.__world.clear_logs()
+        return {"kills": kills, "migrants": migrants, "logs": logs}
+
+    def __settle(self, kills: list[int], immigrants: list[dict[str, Any]]) -> int:
+        for owner_id in kills:
+            entity = self.__world.get_entity_by_id(owner_id)
+            if entity is not None and entity.is_alive():
+                entity.die()
+        self.__world.remove_dead_entities()
+
+        for data in immigrants:
+            entity = create_organism(data)
+            if self.__world.get_entity(entity.get_position()) is not None:
+                position = self.__find_free_position(entity.get_position())
+                if position is not None:
+                    entity.set_position(position)
+                elif not isinstance(entity, Human):
+                    self.__world.add_log(
+                        "{} was crowded out", entity, event_type=LogEventType.MOVEMENT
+                    )
+                    continue
+            # Only a full band leaves no free cell, and the player still
+            # takes the one it arrived at.
+            self.__world.add_entity(entity, force=isinstance(entity, Human))
+            if isinstance(entity, Human):
+                self.__world.set_player(entity)
+        return len(self.__world.get_entities())
+
+    def __find_free_position(
+        self, position: PositionSquare | PositionHexagon
+    ) -> Optional[PositionSquare | PositionHexagon]:
+        # Two shards can move organisms into the same cell at the band edge,
+        # so the one arriving second takes the closest free cell in the band.
+        adjacent = self.__world.get_random_adjacent_position(position, empty=True)
+        if (
+            adjacent is not None
+            and self.__world.is_position_in_world(adjacent)
+            and self.__is_in_band(adjacent[1])
+        ):
+            return adjacent
+        visited = {(position[0], position[1])}
+        queue = deque([(position[0], position[1])])
+        while queue:
+            x, y = queue.popleft()
+            for neighbour in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                candidate = PositionSquare(*neighbour)
+                if (
+                    neighbour in visited
+                    or not self.__world.is_position_in_world(candidate)
+                    or not self.__is_in_band(neighbour[1])
+                ):
+                    continue
+                if self.__world.get_entity(candidate) is None:
+                    return candidate
+                visited.add(neighbour)
+                queue.append(neighbour)
+        return None
+
+    def __is_in_band(self, row: int) -> bool:
+        return self.__first_row <= row < self.__last_row
+
+
+def run_shard_worker(
+    connection: Connection,
+    first_row: int,
+    last_row: int,
+    data: dict[str, Any],
+    seed: Optional[int],
+) -> None:
+    ShardWorker(connection, first_row, last_row, data, seed).run()
+
+
+class ShardedSimulation:
+    __width: int
+    __height: int
+    __band_height: int
+    __connections: list[Connection]
+    __processes: list[multiprocessing.process.BaseProcess]
+    __logs: list[str]
+    __population: int
+
+    def __init__(
+        self,
+        world: World,
+        shards: int = Config.SHARD_COUNT,
+        seed: Optional[int] = None,
+    ) -> None:
+        if world.get_type() != World.WorldType.SQUARE:
+            raise ValueError("Sharding supports square worlds only")
+        self.__width = world.get_width()
+        self.__height = world.get_height()
+        self.__band_height = max(ceil(self.__height / shards), Config.SHARD_HALO_ROWS)
+        self.__connections = []
+        self.__processes = []
+        self.__logs = []
+        self.__population = len(world.get_entities())
+
+        data = world.__dict__()
+        # Each shard gets a part of the entity list, so the schedule's
+        # indices into it do not carry over.
+        data.pop("schedule", None)
+        data.pop("schedule_start", None)
+        player = data["player"]
+        bands = range(0, self.__height, self.__band_height)
+        for index, first_row in enumerate(bands):
+            last_row = min(first_row + self.__band_height, self.__height)
+            shard_data = {
+                **data,
+                "player": (
+                    player
+                    if player is not None
+                    and self.__get_shard(player["position"]["y"]) == index
+                    else None
+                ),
+                "entities": [
+                    entity
+                    for entity in data["entities"]
+                    if self.__get_shard(entity["position"]["y"]) == index
+                ],
+            }
+            parent_connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_shard_worker,
+                args=(
+                    child_connection,
+                    first_row,
+                    last_row,
+                    shard_data,
+                    None if seed is None else seed + index,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self.__connections.append(parent_connection)
+            self.__processes.append(process)
+
+    def __enter__(self) -> "ShardedSimulation":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def next_turn(
+        self, player_direction: DirectionSquare = DirectionSquare.NONE
+    ) -> None:
+        halos = self.__broadcast(("halo",))
+
+        for index, connection in enumerate(self.__connections):
+            ghosts = []
+            if index > 0:
+                ghosts += [(index - 1, *ghost) for ghost in halos[index - 1]["down"]]
+            if index < len(self.__connections) - 1:
+                ghosts += [(index + 1, *ghost) for ghost in halos[index + 1]["up"]]
+            connection.send(("turn", player_direction, ghosts))
+        results = [connection.recv() for connection in self.__connections]
+
+        kills: list[list[int]] = [[] for _ in self.__connections]
+        immigrants: list[list[dict[str, Any]]] = [[] for _ in self.__connections]
+        for result in results:
+            for owner, owner_id in result["kills"]:
+                kills[owner].append(owner_id)
+            for migrant in result["migrants"]:
+                immigrants[self.__get_shard(migrant["position"]["y"])].append(migrant)
+            self.__logs += result["logs"]
+
+        for index, connection in enumerate(self.__connections):
+            connection.send(("settle", kills[index], immigrants[index]))
+        self.__population = sum(connection.recv() for connection in self.__connections)
+
+    def gather(self) -> World:
+        parts = self.__broadcast(("gather",))
+        world = World(self.__width, self.__height)
+        world.set_from_dict(
+            {
+                **parts[0],
+                "player": next(
+                    (part["player"] for part in parts if part["player"] is not None),
+                    None,
+                ),
+                "entities": [entity for part in parts for entity in part["entities"]],
+            }
+        )
+        return world
+
+    def close(self) -> None:
+        for connection in self.__connections:
+            connection.send(("stop",))
+        for process in self.__processes:
+            process.join()
+        self.__connections = []
+        self.__processes = []
+
+    def get_logs(self) -> list[str]:
+        return self.__logs
+
+    def clear_logs(self) -> None:
+        self.__logs = []
+
+    def get_population(self) -> int:
+        return self.__population
+
+    def get_shard_count(self) -> int:
+        return len(self.__connections)
+
+    def __broadcast(self, message: tuple[Any, ...]) -> list[Any]:
+        for connection in self.__connections:
+            connection.send(message)
+        return [connection.recv() for connection in self.__connections]
+
+    def __get_shard(self, row: int) -> int:
+        return row // self.__band_height
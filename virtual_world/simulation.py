@@ -1,9 +1,11 @@
+from typing import Optional
+
 from virtual_world.renderer.application import Application
 
 
 class Simulation:
-    def __init__(self) -> None:
-        self.renderer = Application()
+    def __init__(self, server_address: Optional[tuple[str, int]] = None) -> None:
+        self.renderer = Application(server_address)
 
     def run(self) -> None:
         self.renderer.run()
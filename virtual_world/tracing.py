@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, Optional
+
+
+class Tracer:
+    __events: list[dict[str, Any]]
+    __start: int
+    __process_id: int
+    __batch: Optional[str]
+    __lookups: int
+
+    def __init__(self) -> None:
+        self.__start = time.perf_counter_ns()
+        self.__process_id = os.getpid()
+        self.clear()
+
+    def __get_event(self, name: str, category: str, phase: str) -> dict[str, Any]:
+        # Trace viewers expect microseconds since an arbitrary origin.
+        return {
+            "name": name,
+            "cat": category,
+            "ph": phase,
+            "ts": (time.perf_counter_ns() - self.__start) / 1000,
+            "pid": self.__process_id,
+            "tid": threading.get_native_id(),
+        }
+
+    def begin(self, name: str, category: str, **args: Any) -> None:
+        event = self.__get_event(name, category, "B")
+        if args:
+            event["args"] = args
+        self.__events.append(event)
+
+    def end(self, name: str, category: str) -> None:
+        self.__events.append(self.__get_event(name, category, "E"))
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[None]:
+        self.begin(name, category, **args)
+        try:
+            yield
+        finally:
+            self.end(name, category)
+
+    def batch(self, name: str) -> None:
+        # Organisms act in initiative order, so consecutive organisms of the
+        # same species share one span instead of getting one each.
+        if name == self.__batch:
+            return
+        self.end_batch()
+        self.begin(name, "species")
+        self.__batch = name
+
+    def end_batch(self) -> None:
+        if self.__batch is not None:
+            self.end(self.__batch, "species")
+            self.__batch = None
+
+    def counter(self, name: str, values: Mapping[str, float]) -> None:
+        event = self.__get_event(name, "counter", "C")
+        event["args"] = dict(values)
+        self.__events.append(event)
+
+    def count_lookup(self) -> None:
+        self.__lookups += 1
+
+    def take_lookups(self) -> int:
+        lookups = self.__lookups
+        self.__lookups = 0
+        return lookups
+
+    def get_events(self) -> list[dict[str, Any]]:
+        return self.__events
+
+    def clear(self) -> None:
+        self.__events = []
+        self.__batch = None
+        self.__lookups = 0
+
+    def save(self, path: str) -> None:
+        self.end_batch()
+        with open(path, "w") as file:
+            json.dump({"traceEvents": self.__events, "displayTimeUnit": "ms"}, file)
@@ -1,8 +1,20 @@
+import bisect
+import copy
+import itertools
 import json
 import random
+from contextlib import nullcontext
 from enum import Enum
-from math import ceil
-from typing import Optional, Type
+from math import ceil, floor, log
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Iterator,
+    Optional,
+    Type,
+    TypedDict,
+)
 
 import virtual_world
 from virtual_world.config import Config
@@ -10,8 +22,13 @@ from virtual_world.organisms.direction import (
     DirectionSquare,
     DirectionHexagon,
 )
+from virtual_world.diff import TurnDiff
+from virtual_world.entities import EntityStore
+from virtual_world.grid import ChunkedGrid, HexagonalGrid
+from virtual_world.logs import LogEventType, RingBuffer
 from virtual_world.organisms.factory import OrganismFactory
 from virtual_world.organisms.position import PositionSquare, PositionHexagon
+from virtual_world.tracing import Tracer
 
 
 class World:
@@ -21,29 +38,112 @@ class World:
         SQUARE = 0
         HEXAGONAL = 1
 
-    __entities: list["organism.Organism"]
-    __logs: list[str]
+    class TurnMode(Enum):
+        SEQUENTIAL = 0
+        SYNCHRONOUS = 1
+        SCHEDULED = 2
+
+    DIRECTION_OFFSETS: dict[
+        WorldType, list[tuple[DirectionSquare | DirectionHexagon, int, int]]
+    ] = {
+        WorldType.SQUARE: [
+            (DirectionSquare.UP, 0, -1),
+            (DirectionSquare.DOWN, 0, 1),
+            (DirectionSquare.RIGHT, 1, 0),
+            (DirectionSquare.LEFT, -1, 0),
+        ],
+        WorldType.HEXAGONAL: [
+            (DirectionHexagon.LEFT, -1, 0),
+            (DirectionHexagon.RIGHT, 1, 0),
+            (DirectionHexagon.UP_LEFT, 0, -1),
+            (DirectionHexagon.UP_RIGHT, 1, -1),
+            (DirectionHexagon.DOWN_LEFT, -1, 1),
+            (DirectionHexagon.DOWN_RIGHT, 0, 1),
+        ],
+    }
+
+    DIRECTIONS: dict[WorldType, tuple[DirectionSquare | DirectionHexagon, ...]] = {
+        WorldType.SQUARE: tuple(
+            direction
+            for direction in DirectionSquare
+            if direction != DirectionSquare.NONE
+        ),
+        WorldType.HEXAGONAL: tuple(
+            direction
+            for direction in DirectionHexagon
+            if direction != DirectionHexagon.NONE
+        ),
+    }
+
+    __entities: EntityStore
+    __dead_entities: list["organism.Organism"]
+    __schedule: Optional[dict[int, list[int]]] = None
+    __schedule_start: int = 0
+    __always_active: set["organism.Organism"]
+    __aging_turn: int = 0
+    __species_counts: dict[str, int]
+    __grid: ChunkedGrid | HexagonalGrid
+    __threats: dict[tuple[int, int], int]
+    __halo_entities: set["organism.Organism"]
+    __heracleum_victims: Optional[dict["organism.Organism", list["organism.Organism"]]]
+    __dirty_positions: Optional[set[PositionSquare | PositionHexagon]]
+    __logs: RingBuffer[tuple[LogEventType, str]]
+    __logging: bool = True
+    __turn_order: list["organism.Organism"]
+    __births: Optional[list["organism.Organism"]] = None
     __turn: int
     __width: int
     __height: int
     __type: WorldType
+    __turn_mode: TurnMode
+    __seed: int
+    __random: random.Random
+    __tracer: Optional[Tracer] = None
+    __diff: Optional[TurnDiff] = None
     __player: Optional["virtual_world.organisms.animals.animals.Human"] = None
+    __generations: Iterator[int] = itertools.count()
+    __generation: int
+    __shared_entities: int = 0
 
     def __init__(
         self,
         width: int = Config.WORLD_WIDTH,
         height: int = Config.WORLD_HEIGHT,
         world_type: WorldType = WorldType.SQUARE,
+        turn_mode: TurnMode = TurnMode.SEQUENTIAL,
+        seed: Optional[int] = None,
     ) -> None:
         from virtual_world.organisms.animals.animals import Human
 
-        self.__entities = []
-        self.__logs = []
+        self.__generation = next(World.__generations)
+        self.__entities = EntityStore()
+        self.__dead_entities = []
+        self.__schedule = None
+        self.__always_active = set()
+        self.__aging_turn = 0
+        self.__species_counts = {}
+        self.__threats = {}
+        self.__halo_entities = set()
+        self.__heracleum_victims = None
+        self.__dirty_positions = None
+        self.__logs = RingBuffer()
+        self.__turn_order = []
+        self.__tracer = None
+        self.__diff = None
         self.__turn = 0
         self.__width = width
         self.__height = height
         self.__type = world_type
-        self.__player = Human(PositionSquare(*Config.HUMAN_DEFAULT_POSITION))
+        self.__turn_mode = turn_mode
+        self.set_seed(seed)
+        self.__grid = self.__create_grid()
+        x, y = Config.HUMAN_DEFAULT_POSITION
+        if world_type == World.WorldType.SQUARE:
+            self.__player = Human(PositionSquare(x, y))
+        elif world_type == World.WorldType.HEXAGONAL:
+            self.__player = Human(PositionHexagon(x, y, -x - y))
+        else:
+            raise ValueError("Invalid world type")
         self.add_entity(self.__player)
 
     def add_entity(self, entity: "organism.Organism", force: bool = False) -> None:
@@ -56,55 +156,480 @@ class World:
             and entity.is_alive()
             and (self.is_position_in_world(entity.get_position()))
         ):
-            entity.set_world(self)
-            self.__entities.append(entity)
+            self.__insert_entity(entity)
+            self.__update_heracleum_victims(entity, None, entity.get_position())
+
+    def __insert_entity(self, entity: "organism.Organism") -> None:
+        entity.set_world(self)
+        entity_id = self.__entities.add(entity)
+        self.__count_species(entity, 1)
+        if entity.get_activity_chance() is None:
+            self.__always_active.add(entity)
+        self.__grid.set(entity.get_position(), entity)
+        self.__mark_dirty(entity.get_position())
+        self.update_threat(entity.get_position())
+        self.__schedule_entity(entity)
+        if self.__births is not None:
+            self.__births.append(entity)
+        if self.__diff is not None:
+            self.__diff.add_born(entity_id, entity)
+
+    def populate(
+        self,
+        densities: Optional[dict[str, float]] = None,
+        counts: Optional[dict[str, int]] = None,
+        region: Optional[tuple[tuple[int, int], tuple[int, int]]] = None,
+        mask: Optional[Callable[[int, int], float]] = None,
+    ) -> int:
+        if (densities is None) == (counts is None):
+            raise ValueError("Population needs either densities or counts")
+        names = list(densities or counts or {})
+        species_classes = {
+            name: type(OrganismFactory.create_base_organism(name)) for name in names
+        }
+        cells = self.__get_free_cells(region)
+        weights = [mask(x, y) for x, y in cells] if mask is not None else None
+
+        species: list[str] = []
+        if counts is not None:
+            if weights is not None:
+                cells = [cell for cell, weight in zip(cells, weights) if weight > 0]
+            total = sum(counts.values())
+            if total > len(cells):
+                raise ValueError(f"Only {len(cells)} free cells for {total} organisms")
+            # The sample comes back in random order, so the species can be
+            # handed out in blocks.
+            cells = self.__random.sample(cells, total)
+            species = [name for name, count in counts.items() for _ in range(count)]
+        elif densities is not None:
+            thresholds = list(itertools.accumulate(densities.values()))
+            if thresholds and thresholds[-1] > 1:
+                raise ValueError("Densities add up to more than 1")
+            chosen_cells = []
+            for index, cell in enumerate(cells):
+                value = self.__random.random()
+                if weights is not None:
+                    if weights[index] <= 0:
+                        continue
+                    value /= weights[index]
+                species_index = bisect.bisect_right(thresholds, value)
+                if species_index < len(names):
+                    chosen_cells.append(cell)
+                    species.append(names[species_index])
+            cells = chosen_cells
+
+        for (x, y), name in zip(cells, species):
+            position: PositionSquare | PositionHexagon
+            if self.__type == World.WorldType.SQUARE:
+                position = PositionSquare(x, y)
+            else:
+                position = PositionHexagon(x, y, -x - y)
+            self.__insert_entity(species_classes[name](position))
+        self.__heracleum_victims = None
+        return len(species)
+
+    def __get_free_cells(
+        self, region: Optional[tuple[tuple[int, int], tuple[int, int]]]
+    ) -> list[tuple[int, int]]:
+        if self.__type == World.WorldType.SQUARE:
+            first, last = (0, 0), (self.__width - 1, self.__height - 1)
+        elif self.__type == World.WorldType.HEXAGONAL:
+            half_width = ceil(self.__width / 2)
+            half_height = ceil(self.__height / 2)
+            first, last = (-half_width, -half_height), (half_width - 1, half_height - 1)
+        else:
+            raise ValueError("Invalid world type")
+        if region is not None:
+            first = (max(first[0], region[0][0]), max(first[1], region[0][1]))
+            last = (min(last[0], region[1][0]), min(last[1], region[1][1]))
+
+        # Dead organisms and halo copies block a cell for add_entity too, and
+        # the player's starting cell is kept free for a new human.
+        occupied = {
+            (entity.get_position()[0], entity.get_position()[1])
+            for entity in itertools.chain(self.__entities, self.__halo_entities)
+        }
+        occupied.add(Config.HUMAN_DEFAULT_POSITION)
+        return [
+            (x, y)
+            for y in range(first[1], last[1] + 1)
+            for x in range(first[0], last[0] + 1)
+            if (x, y) not in occupied and self.__is_cell_in_world(x, y)
+        ]
 
     def remove_entity(self, entity: "organism.Organism") -> None:
+        entity = self.__own(entity)
         entity.die()
         self.__entities.remove(entity)
+        self.__count_species(entity, -1)
+        self.__always_active.discard(entity)
+        self.__grid.remove(entity.get_position(), entity)
+        self.__mark_dirty(entity.get_position())
+        self.update_threat(entity.get_position())
+        self.__update_heracleum_victims(entity, entity.get_position(), None)
+
+    def add_halo_entity(self, entity: "organism.Organism") -> None:
+        entity.set_world(self)
+        self.__halo_entities.add(entity)
+        self.__grid.set(entity.get_position(), entity)
+        self.update_threat(entity.get_position())
+        self.__update_heracleum_victims(entity, None, entity.get_position())
+
+    def remove_halo_entity(self, entity: "organism.Organism") -> None:
+        self.__halo_entities.discard(entity)
+        self.__grid.remove(entity.get_position(), entity)
+        self.update_threat(entity.get_position())
+        self.__update_heracleum_victims(entity, entity.get_position(), None)
+
+    def __create_grid(self) -> ChunkedGrid | HexagonalGrid:
+        if self.__type == World.WorldType.SQUARE:
+            return ChunkedGrid()
+        elif self.__type == World.WorldType.HEXAGONAL:
+            # Huge hexagonal worlds are mostly empty, so they keep the sparse
+            # chunked storage instead of a dense array.
+            if self.__width * self.__height > Config.HEX_GRID_MAX_CELLS:
+                return ChunkedGrid()
+            return HexagonalGrid(self.__width, self.__height)
+        else:
+            raise ValueError("Invalid world type")
 
     def get_entity(
         self, position: PositionSquare | PositionHexagon
     ) -> Optional["organism.Organism"]:
-        for entity in self.__entities:
-            if entity.get_position() == position:
-                return entity
-        return None
+        if self.__tracer is not None:
+            self.__tracer.count_lookup()
+        entity = self.__grid.get(position)
+        if entity is not None and self.__shared_entities:
+            return self.__own(entity)
+        return entity
 
-    def next_turn(self, player_direction: DirectionSquare | DirectionHexagon) -> None:
-        from virtual_world.organisms.animals.animals import Human
+    def __own(self, entity: "organism.Organism") -> "organism.Organism":
+        if (
+            not self.__shared_entities
+            or entity.get_generation() == self.__generation
+            or not self.__entities.contains(entity)
+        ):
+            return entity
+        # Organisms shared with a fork are copied the first time this world
+        # hands one out, so neither world sees the other's changes. The worlds
+        # share the aging clock up to the fork, so the age is taken from it.
+        age = entity.get_age() + self.__aging_turn - entity.get_world().get_aging_turn()
+        clone = copy.copy(entity)
+        clone.set_world(self)
+        clone.set_age(age)
+        self.__entities.replace(entity, clone)
+        self.__shared_entities -= 1
+        self.__grid.replace(entity.get_position(), entity, clone)
+        if entity in self.__always_active:
+            self.__always_active.discard(entity)
+            self.__always_active.add(clone)
+        if not entity.is_alive():
+            self.__dead_entities = [
+                clone if dead_entity is entity else dead_entity
+                for dead_entity in self.__dead_entities
+            ]
+        if entity is self.__player:
+            self.__player = clone  # type: ignore # assignment
+        return clone
+
+    def __own_all(self) -> None:
+        if self.__shared_entities:
+            for entity in self.__entities:
+                self.__own(entity)
+
+    def next_turn(
+        self, player_direction: DirectionSquare | DirectionHexagon
+    ) -> Optional[TurnDiff]:
+        if self.__tracer is None:
+            self.__run_turn(self.__order_turn(), player_direction, None)
+            return self.take_diff()
+        with self.__tracer.span("next_turn", "world", turn=self.__turn):
+            self.__run_turn(self.__order_turn(), player_direction, self.__tracer)
+        self.__tracer.counter("population", self.__species_counts.copy())
+        self.__tracer.counter(
+            "occupancy",
+            {
+                "lookups": self.__tracer.take_lookups(),
+                "occupied_cells": len(self.__grid),
+                "occupied_chunks": len(self.__grid.get_chunk_keys()),
+            },
+        )
+        return self.take_diff()
+
+    @staticmethod
+    def __get_order_key(entity: "organism.Organism") -> tuple[int, int, int]:
+        # The store does not keep insertion order, so the sequence number
+        # breaks ties the way a stable sort of the insertion order did.
+        return (-entity.get_initiative(), -entity.get_age(), entity.get_sequence())
+
+    def __order_turn(self) -> list["organism.Organism"]:
+        # The turn order list is kept between turns so that its storage is
+        # reused instead of allocating a new copy of the entities every turn.
+        __entities_copy = self.__turn_order
+        if self.__turn_mode == World.TurnMode.SCHEDULED:
+            __entities_copy[:] = self.__get_scheduled_entities()
+        else:
+            __entities_copy[:] = self.__entities.get_entities()
+        if self.__shared_entities:
+            __entities_copy[:] = [self.__own(entity) for entity in __entities_copy]
+        __entities_copy.sort(key=World.__get_order_key)
+        return __entities_copy
 
-        __entities_copy = self.__entities.copy()
-        __entities_copy.sort(
-            key=lambda entity_in_loop: (
-                entity_in_loop.get_initiative(),
-                entity_in_loop.get_age(),
-            ),
-            reverse=True,
+    def __get_turn_key(
+        self, entity: "organism.Organism"
+    ) -> tuple[int, int, int, "organism.Organism"]:
+        # Unlike the age, the turn an organism was born in stays the same while
+        # it takes part in turns, so the key can be kept between them.
+        return (
+            -entity.get_initiative(),
+            self.__turn - entity.get_age(),
+            entity.get_sequence(),
+            entity,
         )
-        for entity in __entities_copy:
-            if entity.is_alive() and not isinstance(entity, Human):
-                entity.action()
-            elif isinstance(entity, Human):
-                entity.action(player_direction)
-            entity.increase_age()
-
-        self.remove_dead_entities()
+
+    def __reorder_turn(
+        self,
+        keys: list[tuple[int, int, int, "organism.Organism"]],
+        removed: bool,
+    ) -> list["organism.Organism"]:
+        assert self.__births is not None
+        if removed:
+            keys[:] = [key for key in keys if key[3].is_alive()]
+        keys.extend(
+            self.__get_turn_key(entity) for entity in self.__births if entity.is_alive()
+        )
+        self.__births.clear()
+        # The keys are compared without calling back into the organisms, and
+        # the survivors are already in order.
+        keys.sort()
+        __entities_copy = self.__turn_order
+        __entities_copy[:] = [key[3] for key in keys]
+        return __entities_copy
+
+    def __run_turn(
+        self,
+        __entities_copy: list["organism.Organism"],
+        player_direction: DirectionSquare | DirectionHexagon,
+        tracer: Optional[Tracer],
+    ) -> None:
+        from virtual_world.organisms.animals.animals import Human
+
+        if self.__turn_mode == World.TurnMode.SYNCHRONOUS:
+            if tracer is not None:
+                tracer.begin("decide", "world")
+            intents = [
+                (
+                    entity,
+                    entity.decide(
+                        player_direction if isinstance(entity, Human) else None
+                    ),
+                )
+                for entity in __entities_copy
+                if entity.is_alive()
+            ]
+            if tracer is not None:
+                tracer.end("decide", "world")
+            for entity, targets in intents:
+                if tracer is not None:
+                    tracer.batch(entity.__class__.__name__)
+                if entity.is_alive():
+                    entity.resolve(targets)
+            if tracer is not None:
+                tracer.end_batch()
+            for entity in __entities_copy:
+                entity.increase_age()
+        elif self.__turn_mode == World.TurnMode.SCHEDULED:
+            for entity in __entities_copy:
+                if tracer is not None:
+                    tracer.batch(entity.__class__.__name__)
+                if isinstance(entity, Human):
+                    entity.action(player_direction)
+                elif not entity.is_alive():
+                    continue
+                elif entity.get_activity_chance() is None:
+                    entity.action()
+                else:
+                    entity.active_action()
+                    if entity.is_alive():
+                        self.__schedule_entity(entity)
+            if tracer is not None:
+                tracer.end_batch()
+        else:
+            for entity in __entities_copy:
+                if tracer is not None:
+                    tracer.batch(entity.__class__.__name__)
+                if entity.is_alive() and not isinstance(entity, Human):
+                    entity.action()
+                elif isinstance(entity, Human):
+                    entity.action(player_direction)
+                entity.increase_age()
+            if tracer is not None:
+                tracer.end_batch()
+
+        with self.trace("remove_dead_entities"):
+            self.remove_dead_entities()
         self.__turn += 1
 
+    class AdvanceRepresentation(TypedDict):
+        turn: int
+        species_counts: dict[str, int]
+        snapshots: list[dict[str, Any]]
+
+    def advance(
+        self,
+        turns: int,
+        *,
+        record: int = 0,
+        player_direction: Optional[DirectionSquare | DirectionHexagon] = None,
+    ) -> AdvanceRepresentation:
+        if player_direction is None:
+            if self.__type == World.WorldType.SQUARE:
+                player_direction = DirectionSquare.NONE
+            elif self.__type == World.WorldType.HEXAGONAL:
+                player_direction = DirectionHexagon.NONE
+            else:
+                raise ValueError("Invalid world type")
+
+        # Nobody watches the turns in between, so the logs, the dirty cells,
+        # the per-turn diffs and the per-turn trace events are all skipped.
+        logging = self.__logging
+        tracer = self.__tracer
+        recording = self.__diff is not None
+        snapshots: list[dict[str, Any]] = []
+        with self.trace("advance", turns=turns):
+            self.__logging = False
+            self.__dirty_positions = None
+            self.__tracer = None
+            self.__diff = None
+            self.__births = []
+            try:
+                self.__advance(turns, record, player_direction, snapshots)
+            finally:
+                self.__logging = logging
+                self.__tracer = tracer
+                self.__births = None
+                if recording:
+                    # The server sends a reset diff as a full snapshot.
+                    self.__diff = TurnDiff(self.__turn)
+                    self.__diff.set_reset(True)
+        return {
+            "turn": self.__turn,
+            "species_counts": self.__species_counts.copy(),
+            "snapshots": snapshots,
+        }
+
+    def __advance(
+        self,
+        turns: int,
+        record: int,
+        player_direction: DirectionSquare | DirectionHexagon,
+        snapshots: list[dict[str, Any]],
+    ) -> None:
+        assert self.__births is not None
+        order = self.__order_turn()
+        keys = []
+        if self.__turn_mode != World.TurnMode.SCHEDULED:
+            keys = [self.__get_turn_key(entity) for entity in order]
+        for turn in range(turns):
+            population = len(order)
+            self.__run_turn(order, player_direction, None)
+            if record and self.__turn % record == 0:
+                snapshots.append(self.__dict__())
+            if turn == turns - 1:
+                break
+            if self.__turn_mode == World.TurnMode.SCHEDULED:
+                self.__births.clear()
+                order = self.__order_turn()
+            else:
+                removed = len(self.__entities) != population + len(self.__births)
+                order = self.__reorder_turn(keys, removed)
+
+    def __get_scheduled_entities(self) -> list["organism.Organism"]:
+        if self.__schedule is None:
+            self.__schedule = {}
+            self.__schedule_start = self.__turn
+            for entity in self.__entities:
+                if entity.is_alive():
+                    self.__schedule_entity(entity)
+        assert self.__schedule is not None
+        due = self.__schedule.pop(self.__turn, [])
+        self.__schedule_start = self.__turn + 1
+        # Advancing the aging clock ages every organism, so only the ones that
+        # act every turn and the ones due this turn are visited.
+        self.__aging_turn += 1
+        entities = []
+        for entity_id in due:
+            due_entity = self.__entities.get(entity_id)
+            if due_entity is not None:
+                entities.append(due_entity)
+        entities.extend(self.__always_active)
+        return entities
+
+    def __schedule_entity(self, entity: "organism.Organism") -> None:
+        activity_chance = entity.get_activity_chance()
+        if self.__schedule is None or activity_chance is None or activity_chance <= 0:
+            return
+        # Turns until an organism that acts with a fixed chance each turn acts
+        # again follow a geometric distribution.
+        delay = 0
+        if activity_chance < 1:
+            delay = floor(log(1 - self.__random.random()) / log(1 - activity_chance))
+        self.__schedule.setdefault(self.__schedule_start + delay, []).append(
+            entity.get_id()  # type: ignore # arg-type
+        )
+
     def get_random_direction(self) -> DirectionSquare | DirectionHexagon:
-        if self.__type == World.WorldType.SQUARE:
-            directions = list(
-                filter(lambda d: d != DirectionSquare.NONE, DirectionSquare)
+        return self.__random.choice(World.DIRECTIONS[self.__type])
+
+    def get_random(self) -> random.Random:
+        return self.__random
+
+    def get_seed(self) -> int:
+        return self.__seed
+
+    def set_seed(self, seed: Optional[int]) -> None:
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.__seed = seed
+        self.__random = random.Random(seed)
+
+    def record_strength_change(self, entity: "organism.Organism") -> None:
+        self.update_threat(entity.get_position())
+        if self.__diff is not None and self.__entities.contains(entity):
+            self.__diff.add_strengthened(
+                entity.get_id(), entity.get_strength()  # type: ignore # arg-type
+            )
+
+    def record_death(self, entity: "organism.Organism") -> None:
+        self.__dead_entities.append(entity)
+        self.update_threat(entity.get_position())
+        if self.__diff is not None and self.__entities.contains(entity):
+            self.__diff.add_died(
+                entity.get_id(), entity.get_position()  # type: ignore # arg-type
             )
-        elif self.__type == World.WorldType.HEXAGONAL:
-            directions = list(filter(lambda d: d != DirectionHexagon.NONE, DirectionHexagon))  # type: ignore
-        else:
-            raise ValueError("Invalid world type")
-        return random.choice(directions)
 
     def remove_dead_entities(self) -> None:
-        self.__entities = [entity for entity in self.__entities if entity.is_alive()]
+        for entity in self.__dead_entities:
+            if self.__entities.contains(entity):
+                self.__entities.remove(entity)
+                self.__count_species(entity, -1)
+                self.__always_active.discard(entity)
+                self.__grid.remove(entity.get_position(), entity)
+                self.__mark_dirty(entity.get_position())
+                self.update_threat(entity.get_position())
+                self.__update_heracleum_victims(entity, entity.get_position(), None)
+        self.__dead_entities = []
+
+    def __count_species(self, entity: "organism.Organism", change: int) -> None:
+        species = entity.__class__.__name__
+        count = self.__species_counts.get(species, 0) + change
+        if count:
+            self.__species_counts[species] = count
+        else:
+            del self.__species_counts[species]
+
+    def get_species_counts(self) -> dict[str, int]:
+        return self.__species_counts
 
     def get_position_in_direction(
         self,
@@ -167,31 +692,206 @@ class World:
         elif self.__type == World.WorldType.HEXAGONAL and isinstance(
             position, PositionHexagon
         ):
-            half_width = ceil(self.__width / 2)
-            half_height = ceil(self.__height / 2)
-            return (
-                position.get_q() + position.get_r() + position.get_s() == 0
-                and -half_width <= position.get_q() < half_width
-                and -half_height <= position.get_r() < half_height
-                and -half_width <= position.get_s() < half_width
-            )
+            return self.__is_cell_in_world(position.get_q(), position.get_r())
         else:
             raise ValueError("Invalid world type")
 
     def get_organism_at_position(
         self, position: PositionSquare | PositionHexagon
     ) -> Optional["organism.Organism"]:
-        for entity in self.__entities:
-            if entity.is_alive() and entity.get_position() == position:
-                return entity
+        if self.__tracer is not None:
+            self.__tracer.count_lookup()
+        entity = self.__grid.get(position)
+        if entity is not None and entity.is_alive():
+            return self.__own(entity)
         return None
 
+    def get_entities_in_area(
+        self, first: tuple[int, int], last: tuple[int, int]
+    ) -> list["organism.Organism"]:
+        entities = list(self.__grid.get_entities_in_area(first, last))
+        if self.__shared_entities:
+            return [self.__own(entity) for entity in entities]
+        return entities
+
+    def get_occupied_chunks(self) -> list[tuple[int, int]]:
+        return self.__grid.get_chunk_keys()
+
+    def get_chunk_populations(self) -> dict[tuple[int, int], int]:
+        return self.__grid.get_chunk_populations()
+
+    def get_chunk_size(self) -> int:
+        return self.__grid.get_chunk_size()
+
+    def get_species_tile_size(self) -> int:
+        if not isinstance(self.__grid, ChunkedGrid):
+            raise ValueError("Invalid world type")
+        return self.__grid.get_tile_size()
+
+    def get_species_tiles(
+        self, first: tuple[int, int], last: tuple[int, int]
+    ) -> Iterator[tuple[tuple[int, int], dict[type["organism.Organism"], int]]]:
+        if not isinstance(self.__grid, ChunkedGrid):
+            raise ValueError("Invalid world type")
+        return self.__grid.get_species_tiles(first, last)
+
+    def get_tile_species(
+        self, tile_key: tuple[int, int]
+    ) -> dict[type["organism.Organism"], int]:
+        if not isinstance(self.__grid, ChunkedGrid):
+            raise ValueError("Invalid world type")
+        return self.__grid.get_tile_species(tile_key)
+
     def move_organism(
-        self, organism: "organism.Organism", position: PositionSquare | PositionHexagon
+        self,
+        organism: "organism.Organism",
+        position: PositionSquare | PositionHexagon,
+        force: bool = False,
     ) -> None:
         if self.is_position_in_world(position):
-            if self.get_organism_at_position(position) is None:
+            if self.get_organism_at_position(position) is None or force:
+                old_position = organism.get_position()
+                self.__grid.remove(old_position, organism)
+                self.__mark_dirty(old_position)
+                self.update_threat(old_position)
                 organism.set_position(position)
+                if (
+                    self.__diff is not None
+                    and organism.is_alive()
+                    and self.__entities.contains(organism)
+                ):
+                    self.__diff.add_moved(
+                        organism.get_id(),  # type: ignore # arg-type
+                        old_position,
+                        position,
+                    )
+                self.__grid.set(position, organism)
+                self.__mark_dirty(position)
+                self.update_threat(position)
+                self.__update_heracleum_victims(organism, old_position, position)
+
+    def get_heracleum_victims(
+        self, heracleum: "organism.Organism"
+    ) -> list["organism.Organism"]:
+        if self.__heracleum_victims is None:
+            self.__heracleum_victims = self.__find_heracleum_victims()
+        return self.__heracleum_victims.get(heracleum, [])
+
+    def __find_heracleum_victims(
+        self,
+    ) -> dict["organism.Organism", list["organism.Organism"]]:
+        heracleums = {}
+        animals = []
+        for entity in itertools.chain(self.__entities, self.__halo_entities):
+            if not entity.is_alive():
+                continue
+            if entity.poisons_neighbours():
+                position = entity.get_position()
+                heracleums[(position[0], position[1])] = self.__own(entity)
+            elif entity.is_harmed_by_heracleum():
+                animals.append(self.__own(entity))
+
+        victims: dict[Any, list[Any]] = {}
+        offsets = World.DIRECTION_OFFSETS[self.__type]
+        for animal in animals:
+            x, y = animal.get_position()[0], animal.get_position()[1]
+            for _, dx, dy in offsets:
+                heracleum = heracleums.get((x + dx, y + dy))
+                if heracleum is not None:
+                    victims.setdefault(heracleum, []).append(animal)
+        return victims
+
+    def __update_heracleum_victims(
+        self,
+        entity: "organism.Organism",
+        old_position: Optional[PositionSquare | PositionHexagon],
+        new_position: Optional[PositionSquare | PositionHexagon],
+    ) -> None:
+        # Only the hogweeds around the cells the organism left and entered
+        # can gain or lose a victim.
+        if self.__heracleum_victims is None:
+            return
+        if entity.poisons_neighbours():
+            self.__heracleum_victims.pop(entity, None)
+            if new_position is not None and entity.is_alive():
+                victims = [
+                    neighbour
+                    for neighbour in self.__get_living_neighbours(new_position)
+                    if neighbour.is_harmed_by_heracleum()
+                ]
+                if victims:
+                    self.__heracleum_victims[entity] = victims
+        elif entity.is_harmed_by_heracleum():
+            if old_position is not None:
+                for neighbour in self.__get_living_neighbours(old_position):
+                    neighbour_victims = self.__heracleum_victims.get(neighbour)
+                    if neighbour_victims is not None and entity in neighbour_victims:
+                        neighbour_victims.remove(entity)
+            if new_position is not None and entity.is_alive():
+                for neighbour in self.__get_living_neighbours(new_position):
+                    if neighbour.poisons_neighbours():
+                        self.__heracleum_victims.setdefault(neighbour, []).append(
+                            entity
+                        )
+
+    def __get_living_neighbours(
+        self, position: PositionSquare | PositionHexagon
+    ) -> Iterator["organism.Organism"]:
+        for direction in World.DIRECTIONS[self.__type]:
+            neighbour = self.__grid.get(
+                self.get_position_in_direction(position, direction)
+            )
+            if neighbour is not None and neighbour.is_alive():
+                yield self.__own(neighbour)
+
+    def update_threat(self, position: PositionSquare | PositionHexagon) -> None:
+        cell = (position[0], position[1])
+        entity = self.__grid.get(position)
+        if entity is not None and entity.is_alive():
+            self.__threats[cell] = entity.get_strength()
+        else:
+            self.__threats.pop(cell, None)
+
+    def get_threat(self, position: PositionSquare | PositionHexagon) -> Optional[int]:
+        return self.__threats.get((position[0], position[1]))
+
+    def get_safe_directions(
+        self, position: PositionSquare | PositionHexagon, strength: int
+    ) -> list[DirectionSquare | DirectionHexagon]:
+        x, y = position[0], position[1]
+        safe_directions = []
+        for direction, dx, dy in World.DIRECTION_OFFSETS[self.__type]:
+            threat = self.__threats.get((x + dx, y + dy))
+            if threat is None:
+                if self.__is_cell_in_world(x + dx, y + dy):
+                    safe_directions.append(direction)
+            elif strength > threat:
+                safe_directions.append(direction)
+        return safe_directions
+
+    def __is_cell_in_world(self, x: int, y: int) -> bool:
+        if isinstance(self.__grid, HexagonalGrid):
+            return self.__grid.is_valid(x, y)
+        elif self.__type == World.WorldType.SQUARE:
+            return 0 <= x < self.__width and 0 <= y < self.__height
+        half_width = ceil(self.__width / 2)
+        half_height = ceil(self.__height / 2)
+        return (
+            -half_width <= x < half_width
+            and -half_height <= y < half_height
+            and -half_width <= -x - y < half_width
+        )
+
+    def __mark_dirty(self, position: PositionSquare | PositionHexagon) -> None:
+        if self.__dirty_positions is not None:
+            self.__dirty_positions.add(position)
+
+    def take_dirty_positions(
+        self,
+    ) -> Optional[set[PositionSquare | PositionHexagon]]:
+        dirty_positions = self.__dirty_positions
+        self.__dirty_positions = set()
+        return dirty_positions
 
     def get_random_adjacent_position(
         self, position: PositionSquare | PositionHexagon, empty: bool = False
@@ -216,7 +916,7 @@ class World:
             if len(choices) == 0:
                 return None
 
-            return random.choice(choices)
+            return self.__random.choice(choices)
         elif self.__type == World.WorldType.HEXAGONAL and isinstance(
             position, PositionHexagon
         ):
@@ -251,7 +951,7 @@ class World:
             if len(choices_hex) == 0:
                 return None
 
-            return random.choice(choices_hex)
+            return self.__random.choice(choices_hex)
         else:
             raise ValueError("Invalid world type")
 
@@ -271,8 +971,20 @@ class World:
                 if neighbour is not None:
                     neighbours.append(neighbour)
             return neighbours
+        elif self.__type == World.WorldType.HEXAGONAL and isinstance(
+            position, PositionHexagon
+        ):
+            q, r = position.get_axial()
+            neighbours = []
+            for _, dq, dr in World.DIRECTION_OFFSETS[self.__type]:
+                neighbour = self.__grid.get(
+                    PositionHexagon(q + dq, r + dr, -q - dq - r - dr)
+                )
+                if neighbour is not None and neighbour.is_alive():
+                    neighbours.append(self.__own(neighbour))
+            return neighbours
         else:
-            raise NotImplementedError
+            raise ValueError("Invalid world type")
 
     def get_closest_organism_of_type(
         self,
@@ -282,19 +994,41 @@ class World:
         if self.__type == World.WorldType.SQUARE and isinstance(
             position, PositionSquare
         ):
+            # Ties go to the oldest entry, as they did when the entities were
+            # kept in insertion order.
             closest = None
             closest_distance = None
             for entity in self.__entities:
                 if isinstance(entity, organism_type):
                     entity_position = entity.get_position()
                     if isinstance(entity_position, PositionSquare):
-                        distance = position.get_distance(entity_position)
-                        if closest is None or distance < closest_distance:
+                        distance = (
+                            position.get_distance(entity_position),
+                            entity.get_sequence(),
+                        )
+                        if closest_distance is None or distance < closest_distance:
+                            closest = entity
+                            closest_distance = distance
+            return self.__own(closest) if closest is not None else None
+        elif self.__type == World.WorldType.HEXAGONAL and isinstance(
+            position, PositionHexagon
+        ):
+            closest = None
+            closest_distance = None
+            for entity in self.__entities:
+                if isinstance(entity, organism_type):
+                    entity_position = entity.get_position()
+                    if isinstance(entity_position, PositionHexagon):
+                        distance = (
+                            position.get_distance(entity_position),
+                            entity.get_sequence(),
+                        )
+                        if closest_distance is None or distance < closest_distance:
                             closest = entity
                             closest_distance = distance
-            return closest
+            return self.__own(closest) if closest is not None else None
         else:
-            raise NotImplementedError
+            raise ValueError("Invalid world type")
 
     def get_direction_to_position(
         self,
@@ -316,70 +1050,334 @@ class World:
                 return DirectionSquare.UP
             else:
                 raise NotImplementedError
+        elif (
+            self.__type == World.WorldType.HEXAGONAL
+            and isinstance(position, PositionHexagon)
+            and isinstance(target_position, PositionHexagon)
+        ):
+            if position == target_position:
+                return DirectionHexagon.NONE
+            q, r = position.get_axial()
+            target_q, target_r = target_position.get_axial()
+            closest_direction: DirectionSquare | DirectionHexagon = (
+                DirectionHexagon.NONE
+            )
+            closest_distance = None
+            for direction, dq, dr in World.DIRECTION_OFFSETS[self.__type]:
+                distance = max(
+                    abs(target_q - q - dq),
+                    abs(target_r - r - dr),
+                    abs(target_q + target_r - q - dq - r - dr),
+                )
+                if closest_distance is None or distance < closest_distance:
+                    closest_direction = direction
+                    closest_distance = distance
+            return closest_direction
         else:
-            raise NotImplementedError
+            raise ValueError("Invalid world type")
 
     def move_player(self, direction: DirectionSquare | DirectionHexagon) -> None:
         if self.__player is not None:
+            self.__own(self.__player)
             self.__player.action(direction)
 
     def use_player_ability(self) -> None:
         if self.__player is not None:
+            self.__own(self.__player)
             self.__player.use_special_ability()
 
     def get_player(self) -> Optional["virtual_world.organisms.animals.animals.Human"]:
+        if self.__player is not None:
+            self.__own(self.__player)
         return self.__player
 
+    def set_player(
+        self, player: Optional["virtual_world.organisms.animals.animals.Human"]
+    ) -> None:
+        self.__player = player
+
     def __dict__(self) -> dict:  # type: ignore # override
         from virtual_world.organisms.animals.animals import Human
 
-        return {
+        self.__own_all()
+        entities = [
+            entity
+            for entity in self.__entities.get_entities_in_order()
+            if not isinstance(entity, Human)
+        ]
+        data = {
             "turn": self.__turn,
             "width": self.__width,
             "height": self.__height,
+            "type": self.__type.name,
+            "seed": self.__seed,
+            "random_state": self.__random.getstate(),
             "player": self.__player.__dict__() if self.__player is not None else None,
-            "entities": [
-                entity.__dict__()
-                for entity in self.__entities
-                if not isinstance(entity, Human)
-            ],
+            "entities": [entity.__dict__() for entity in entities],
         }
+        if self.__schedule is not None:
+            # Store ids change on load, so the schedule refers to organisms
+            # by their place in the entity list.
+            indices = {entity.get_id(): index for index, entity in enumerate(entities)}
+            data["schedule_start"] = self.__schedule_start
+            data["schedule"] = [
+                [
+                    turn,
+                    [indices[entity_id] for entity_id in due if entity_id in indices],
+                ]
+                for turn, due in self.__schedule.items()
+            ]
+        return data
+
+    def set_from_dict(self, data: dict[str, Any]) -> None:
+        from virtual_world.organisms.animals.animals import Human
+
+        self.__turn = data["turn"]
+        self.__width = data["width"]
+        self.__height = data["height"]
+        if "type" in data:
+            self.__type = World.WorldType[data["type"]]
+        if "seed" in data:
+            self.set_seed(data["seed"])
+        if "random_state" in data:
+            version, state, gauss_next = data["random_state"]
+            self.__random.setstate((version, tuple(state), gauss_next))
+        self.__entities = EntityStore()
+        self.__shared_entities = 0
+        self.__dead_entities = []
+        self.__schedule = None
+        self.__always_active = set()
+        self.__species_counts = {}
+        self.__grid = self.__create_grid()
+        self.__threats = {}
+        self.__halo_entities = set()
+        self.__heracleum_victims = None
+        self.__dirty_positions = None
+        if self.__diff is not None:
+            # Everything is replaced, so the diff starts over and lists the
+            # whole loaded population as born.
+            self.__diff = TurnDiff(self.__turn)
+            self.__diff.set_reset(True)
+        if data["player"] is not None:
+            self.__player = Human()
+            self.__player.set_from_dict(data["player"])
+            self.add_entity(self.__player)
+        else:
+            self.__player = None
+        entities = []
+        for entity_data in data["entities"]:
+            entity = OrganismFactory.create(entity_data)
+            self.add_entity(entity)
+            entities.append(entity)
+        if "schedule" in data:
+            self.__schedule = {
+                turn: [
+                    entities[index].get_id()
+                    for index in due
+                    if self.__entities.contains(entities[index])
+                ]
+                for turn, due in data["schedule"]
+            }
+            self.__schedule_start = data["schedule_start"]
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "entities": self.__entities,
+            "logs": self.__logs,
+            "turn": self.__turn,
+            "width": self.__width,
+            "height": self.__height,
+            "type": self.__type,
+            "turn_mode": self.__turn_mode,
+            "seed": self.__seed,
+            "random": self.__random,
+            "aging_turn": self.__aging_turn,
+            "schedule": self.__schedule,
+            "schedule_start": self.__schedule_start,
+            "logging": self.__logging,
+            "player": self.__player,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__entities = state["entities"]
+        self.__logs = state["logs"]
+        self.__turn = state["turn"]
+        self.__width = state["width"]
+        self.__height = state["height"]
+        self.__type = state["type"]
+        self.__turn_mode = state["turn_mode"]
+        self.__seed = state["seed"]
+        self.__random = state["random"]
+        self.__aging_turn = state["aging_turn"]
+        self.__logging = state["logging"]
+        self.__generation = next(World.__generations)
+        self.__shared_entities = 0
+        self.__turn_order = []
+        self.__tracer = None
+        self.__diff = None
+        self.__player = state["player"]
+        self.__dead_entities = []
+        # The schedule holds store ids, which the pickled store keeps.
+        self.__schedule = state["schedule"]
+        self.__schedule_start = state["schedule_start"]
+        self.__always_active = set()
+        self.__species_counts = {}
+        self.__grid = self.__create_grid()
+        self.__threats = {}
+        self.__halo_entities = set()
+        self.__heracleum_victims = None
+        self.__dirty_positions = None
+        for entity in self.__entities:
+            entity.set_world(self)
+            if not entity.is_alive():
+                self.__dead_entities.append(entity)
+            self.__count_species(entity, 1)
+            if entity.get_activity_chance() is None:
+                self.__always_active.add(entity)
+            self.__grid.set(entity.get_position(), entity)
+            self.update_threat(entity.get_position())
+
+    def fork(self) -> "World":
+        # The fork shares the organisms and the grid with this world. Both
+        # worlds start a new generation, so whichever one hands out a shared
+        # organism first copies it.
+        world = World.__new__(World)
+        world.__generation = next(World.__generations)
+        world.__entities = self.__entities.copy()
+        world.__shared_entities = len(self.__entities)
+        world.__dead_entities = self.__dead_entities.copy()
+        world.__schedule = None
+        if self.__schedule is not None:
+            world.__schedule = {
+                turn: due.copy() for turn, due in self.__schedule.items()
+            }
+        world.__schedule_start = self.__schedule_start
+        world.__always_active = self.__always_active.copy()
+        world.__aging_turn = self.__aging_turn
+        world.__species_counts = self.__species_counts.copy()
+        world.__grid = self.__grid.fork()
+        world.__threats = self.__threats.copy()
+        world.__halo_entities = self.__halo_entities.copy()
+        world.__heracleum_victims = None
+        world.__dirty_positions = None
+        world.__logs = self.__logs.copy()
+        world.__logging = self.__logging
+        world.__turn_order = []
+        world.__births = None
+        world.__turn = self.__turn
+        world.__width = self.__width
+        world.__height = self.__height
+        world.__type = self.__type
+        world.__turn_mode = self.__turn_mode
+        world.__seed = self.__seed
+        world.__random = random.Random()
+        world.__random.setstate(self.__random.getstate())
+        world.__tracer = None
+        world.__diff = None
+        world.__player = self.__player
+        if self.__player is not None and not self.__entities.contains(self.__player):
+            # A dead player has left the store, so each world keeps its own.
+            world.__player = copy.copy(self.__player)
+            world.__player.set_world(world)
+        self.__generation = next(World.__generations)
+        self.__shared_entities = len(self.__entities)
+        self.__heracleum_victims = None
+        return world
 
     def save(self, path: str) -> None:
-        with open(path, "w+") as file:
-            json.dump(self.__dict__(), file)
+        with self.trace("save", path=path):
+            with open(path, "w+") as file:
+                json.dump(self.__dict__(), file)
 
     def load(self, path: str) -> None:
-        from virtual_world.organisms.animals.animals import Human
-
-        with open(path, "r") as file:
-            data = json.load(file)
-            self.__turn = data["turn"]
-            self.__width = data["width"]
-            self.__height = data["height"]
-            self.__entities = []
-            if data["player"] is not None:
-                self.__player = Human()
-                self.__player.set_from_dict(data["player"])
-                self.add_entity(self.__player)
-            else:
-                self.__player = None
-            for entity_data in data["entities"]:
-                entity = OrganismFactory.create(entity_data)
-                self.add_entity(entity)
+        with self.trace("load", path=path):
+            with open(path, "r") as file:
+                self.set_from_dict(json.load(file))
 
     def get_logs(self) -> list[str]:
-        return self.__logs
+        return [log for _, log in self.__logs]
 
-    def add_log(self, log: str) -> None:
-        self.__logs.append(log)
+    def get_logs_since(self, count: int) -> list[str]:
+        return [log for _, log in self.__logs.get_since(count)]
+
+    def get_log_events_since(self, count: int) -> list[tuple[LogEventType, str]]:
+        return self.__logs.get_since(count)
+
+    def get_log_count(self) -> int:
+        return self.__logs.get_count()
+
+    def add_log(
+        self, log: str, *args: object, event_type: LogEventType = LogEventType.OTHER
+    ) -> None:
+        # Messages are only formatted when they are going to be kept.
+        if self.__logging:
+            self.__logs.append((event_type, log.format(*args) if args else log))
+
+    def is_logging(self) -> bool:
+        return self.__logging
+
+    def set_logging(self, logging: bool) -> None:
+        self.__logging = logging
 
     def clear_logs(self) -> None:
-        self.__logs = []
+        self.__logs.clear()
+
+    def trace(
+        self, name: str, category: str = "world", **args: Any
+    ) -> ContextManager[None]:
+        if self.__tracer is None:
+            return nullcontext()
+        return self.__tracer.span(name, category, **args)
+
+    def __get_player_ability(self) -> Optional[TurnDiff.AbilityRepresentation]:
+        if self.__player is None:
+            return None
+        return {
+            "special_ability_cooldown": self.__player.get_special_ability_cooldown(),
+            "special_ability_duration": self.__player.get_special_ability_duration(),
+            "special_ability_active": self.__player.get_special_ability_active(),
+        }
+
+    def is_recording_diffs(self) -> bool:
+        return self.__diff is not None
+
+    def set_recording_diffs(self, recording: bool) -> None:
+        if recording:
+            self.__diff = TurnDiff(self.__turn, self.__get_player_ability())
+        else:
+            self.__diff = None
+
+    def take_diff(self) -> Optional[TurnDiff]:
+        diff = self.__diff
+        if diff is None:
+            return None
+        player_ability = self.__get_player_ability()
+        diff.close(self.__turn, player_ability)
+        self.__diff = TurnDiff(self.__turn, player_ability)
+        return diff
+
+    def get_tracer(self) -> Optional[Tracer]:
+        return self.__tracer
+
+    def set_tracer(self, tracer: Optional[Tracer]) -> None:
+        self.__tracer = tracer
 
     def get_turn(self) -> int:
         return self.__turn
 
+    def get_aging_turn(self) -> int:
+        return self.__aging_turn
+
+    def increase_aging_turn(self) -> None:
+        self.__aging_turn += 1
+
+    def get_generation(self) -> int:
+        return self.__generation
+
+    def set_turn(self, turn: int) -> None:
+        self.__turn = turn
+        self.__schedule = None
+
     def get_width(self) -> int:
         return self.__width
 
@@ -387,10 +1385,31 @@ class World:
         return self.__height
 
     def get_entities(self) -> list["organism.Organism"]:
-        return self.__entities
+        self.__own_all()
+        return self.__entities.get_entities()
+
+    def get_entity_by_id(self, entity_id: int) -> Optional["organism.Organism"]:
+        entity = self.__entities.get(entity_id)
+        if entity is not None:
+            return self.__own(entity)
+        return None
 
     def get_type(self) -> WorldType:
         return self.__type
 
     def set_type(self, world_type: WorldType) -> None:
         self.__type = world_type
+        self.__grid = self.__create_grid()
+        self.__threats = {}
+        for entity in itertools.chain(self.__entities, self.__halo_entities):
+            self.__grid.set(entity.get_position(), entity)
+            self.update_threat(entity.get_position())
+        self.__dirty_positions = None
+        self.__heracleum_victims = None
+
+    def get_turn_mode(self) -> TurnMode:
+        return self.__turn_mode
+
+    def set_turn_mode(self, turn_mode: TurnMode) -> None:
+        self.__turn_mode = turn_mode
+        self.__schedule = None